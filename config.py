@@ -3,24 +3,84 @@ from ignis.widgets import Widget
 from ignis.utils import Utils
 from ignis.app import IgnisApp
 from ignis.services.notifications import NotificationService
+from ignis.options import options
 import asyncio
 # from ignis.services.mpris import MprisService, MprisPlayer
 
 from modules import (
     NotificationPopup,
+    PopupRouter,
     Bar,
-    ControlCenter
+    BarLayout,
+    ControlCenter,
+    VolumeOsd,
+    DndController,
 )
+from modules.registry import print_import_report
+from modules.notification_popup.notification_popup import SERVICE_POPUP_TIMEOUT
+from modules.utils import MonitorManager
 
 app = IgnisApp.get_default()
 app.apply_css(f"{Utils.get_current_dir()}/style.scss")
 
 notifications = NotificationService.get_default()
 
+# Burst stacks keep many popups open at once, the service must not dismiss
+# the older ones on its own
+options.notifications.max_popups_count = 100
+# Popups expire through the popup scheduler (paused on hover), not the
+# service's own timer
+options.notifications.popup_timeout = SERVICE_POPUP_TIMEOUT
+
+# Panel content is built on first open and freed after CONTENT_IDLE_TIMEOUT closed
 ControlCenter()
 
-for i in range(Utils.get_n_monitors()):
-    NotificationPopup(i)
+# Daily do-not-disturb windows, e.g. [("22:00", "07:00")]
+DndController.get_default().set_schedules([])
+
+# Build each notification popup only on the focused output
+popup_router = PopupRouter(mode="focused")
+
+
+# Bar modules per section and monitor; edits are applied without a restart
+BarLayout.get_default().watch(f"{Utils.get_current_dir()}/layout.toml")
+
+
+# Setup tasks of the bars built at startup, None once they have finished
+startup_bars: list[asyncio.Task] | None = []
+
+
+def new_bar(monitor: int, output: str) -> Bar:
+    bar = Bar(monitor, output=output)
+    task = asyncio.create_task(bar.setup())
+    if startup_bars is not None:
+        startup_bars.append(task)
+    return bar
+
+
+# Windows follow outputs as they are plugged in and out; ones whose output
+# only vanishes briefly (DPMS, dock flaps) are reused
+monitor_manager = MonitorManager(
+    {
+        "notification_popup": lambda monitor, output: NotificationPopup(
+            monitor, router=popup_router, output=output
+        ),
+        "osd": lambda monitor, output: VolumeOsd(monitor, output=output),
+        "bar": new_bar,
+    }
+)
+monitor_manager.start()
+
+
+
+async def report_imports() -> None:
+    global startup_bars
+    # Bars import their modules during setup, wait for all of them
+    tasks, startup_bars = startup_bars or [], None
+    await asyncio.gather(*tasks, return_exceptions=True)
+    # IGNIS_REK_IMPORT_REPORT=1 prints how long each widget module took to
+    # import and whether startup stayed within IGNIS_REK_IMPORT_BUDGET (ms)
+    print_import_report()
+
 
-for i in range(Utils.get_n_monitors()):
-    asyncio.create_task(Bar(i).setup())
+asyncio.create_task(report_imports())
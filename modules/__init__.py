@@ -1,18 +1,52 @@
-from .notification_popup import NotificationPopup
-from .price_tracker import PriceTracker
-from .battery import Battery
-from .tray import Tray
-from .workspaces import Workspaces
-from .title import WindowTitle
-from .audio import Volume, VolumeSlider, VolumeRevealer
-from .power_menu import PowerMenu
-from .control_center import ControlCenter
-from .control_center.notification_icon import NotificationIcon
+from typing import TYPE_CHECKING
 
-from .bar import Bar
+from .registry import lazy_exports
+
+# Widget modules are only imported once something uses them, so modules that
+# are left out of the layout cost nothing at startup
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "NotificationPopup": ".notification_popup",
+        "PopupRouter": ".notification_popup",
+        "DndController": ".notification_popup",
+        "PriceTracker": ".price_tracker",
+        "Battery": ".battery",
+        "Tray": ".tray",
+        "Workspaces": ".workspaces",
+        "WindowTitle": ".title",
+        "Volume": ".audio",
+        "VolumeSlider": ".audio",
+        "VolumeRevealer": ".audio",
+        "LevelMeter": ".audio",
+        "PowerMenu": ".power_menu",
+        "ControlCenter": ".control_center",
+        "NotificationIcon": ".control_center.notification_icon",
+        "Osd": ".osd",
+        "VolumeOsd": ".osd",
+        "Bar": ".bar",
+        "BarLayout": ".bar",
+    },
+)
+
+if TYPE_CHECKING:
+    from .notification_popup import NotificationPopup, PopupRouter, DndController
+    from .price_tracker import PriceTracker
+    from .battery import Battery
+    from .tray import Tray
+    from .workspaces import Workspaces
+    from .title import WindowTitle
+    from .audio import Volume, VolumeSlider, VolumeRevealer, LevelMeter
+    from .power_menu import PowerMenu
+    from .control_center import ControlCenter
+    from .control_center.notification_icon import NotificationIcon
+    from .osd import Osd, VolumeOsd
+    from .bar import Bar, BarLayout
 
 __all__ = [
     "NotificationPopup",
+    "PopupRouter",
+    "DndController",
     "PriceTracker",
     "Battery",
     "Tray",
@@ -21,8 +55,12 @@ __all__ = [
     "Volume",
     "VolumeSlider",
     "VolumeRevealer",
+    "LevelMeter",
     "PowerMenu",
     "Bar",
+    "BarLayout",
     "ControlCenter",
     "NotificationIcon",
+    "Osd",
+    "VolumeOsd",
 ]
@@ -1,6 +1,27 @@
-from .volume import Volume, VolumeSlider, VolumeRevealer
+from typing import TYPE_CHECKING
+
+from ..registry import lazy_exports
+
+# LevelMeter pulls in numpy, only import it when a layout uses it
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "Volume": ".volume",
+        "VolumeSlider": ".volume",
+        "VolumeRevealer": ".volume",
+        "AppMixer": ".mixer",
+        "LevelMeter": ".level_meter",
+    },
+)
+
+if TYPE_CHECKING:
+    from .volume import Volume, VolumeSlider, VolumeRevealer
+    from .mixer import AppMixer
+    from .level_meter import LevelMeter
 
 __all__ = ["Volume",
            "VolumeSlider",
            "VolumeRevealer",
+           "AppMixer",
+           "LevelMeter",
            ]
@@ -0,0 +1,166 @@
+import math
+import subprocess
+import threading
+import time
+from typing import Optional
+
+from ignis.widgets import Widget
+from ignis.services.audio import AudioService
+from gi.repository import Gtk  # type: ignore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Capture format of the monitor source
+SAMPLE_RATE = 44100
+CHANNELS = 2
+# Samples per channel analysed at once (~23 ms)
+BLOCK_FRAMES = 1024
+# Maximum display refresh rate, the frame clock caps it further
+MAX_FPS = 30
+# Levels below this are shown as silence (dBFS)
+FLOOR_DB = -60.0
+# Per-frame decay of the displayed peak
+PEAK_DECAY = 0.92
+
+
+def block_levels(block: bytes) -> tuple[float, float]:
+    """
+    Peak and RMS of an interleaved float32 block, over all channels,
+    computed with vectorized array math.
+    """
+    samples = np.frombuffer(block, dtype=np.float32)
+    if samples.size == 0:
+        return 0.0, 0.0
+    peak = float(np.max(np.abs(samples)))
+    rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+    return peak, rms
+
+
+def to_meter(level: float) -> float:
+    """Map a linear level to 0..1 on a dBFS scale."""
+    if level <= 0:
+        return 0.0
+    db = 20 * math.log10(level)
+    return max(0.0, min(1.0, 1 - db / FLOOR_DB))
+
+
+class LevelMeter(Widget.Box):
+    """
+    A VU meter for the default sink, reading its monitor source through
+    ``parec``.
+
+    Capture only runs while the meter is mapped. To test it against a null
+    sink::
+
+        pactl load-module module-null-sink sink_name=vu_test
+        paplay --device=vu_test some.wav
+
+    and create the meter with ``LevelMeter(device="vu_test.monitor")``.
+    Needs numpy (the ``level-meter`` extra); without it the meter stays
+    hidden.
+    """
+
+    __gtype_name__ = "LevelMeter"
+
+    def __init__(self, device: Optional[str] = None):
+        self.audio = AudioService.get_default()
+        self._device = device
+
+        self._process: Optional[subprocess.Popen] = None
+        self._reader: Optional[threading.Thread] = None
+        self._tick_id: Optional[int] = None
+        self._last_frame = 0.0
+
+        # Written by the reader thread, read on the frame clock
+        self._peak = 0.0
+        self._rms = 0.0
+        self._shown_peak = 0.0
+
+        self._rms_bar = Gtk.LevelBar(min_value=0, max_value=1, hexpand=True)
+        self._rms_bar.add_css_class("level-meter-rms")
+        self._peak_bar = Gtk.LevelBar(min_value=0, max_value=1, hexpand=True)
+        self._peak_bar.add_css_class("level-meter-peak")
+
+        super().__init__(
+            vertical=True,
+            valign="center",
+            css_classes=["level-meter"],
+            child=[self._rms_bar, self._peak_bar],
+            visible=np is not None,
+        )
+
+        if np is None:
+            print("LevelMeter needs numpy (the level-meter extra), hiding it")
+
+        self.connect("map", lambda x: self._start())
+        self.connect("unmap", lambda x: self._stop())
+
+    def _source(self) -> str:
+        if self._device:
+            return self._device
+        return f"{self.audio.speaker.name}.monitor"
+
+    def _start(self):
+        if np is None or self._process is not None:
+            return
+        try:
+            self._process = subprocess.Popen(
+                [
+                    "parec",
+                    f"--device={self._source()}",
+                    "--format=float32le",
+                    f"--rate={SAMPLE_RATE}",
+                    f"--channels={CHANNELS}",
+                    "--raw",
+                    "--latency-msec=20",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            print(f"Error starting level meter capture: {e}")
+            self._process = None
+            return
+
+        self._reader = threading.Thread(
+            target=self._read_blocks, args=(self._process,), daemon=True
+        )
+        self._reader.start()
+        self._tick_id = self.add_tick_callback(self._on_tick)
+
+    def _stop(self):
+        if self._tick_id is not None:
+            self.remove_tick_callback(self._tick_id)
+            self._tick_id = None
+        if self._process is not None:
+            self._process.terminate()
+            self._process = None
+        self._reader = None
+        self._peak = self._rms = self._shown_peak = 0.0
+        self._rms_bar.set_value(0)
+        self._peak_bar.set_value(0)
+
+    def _read_blocks(self, process: subprocess.Popen):
+        block_size = BLOCK_FRAMES * CHANNELS * 4
+        stream = process.stdout
+        while True:
+            block = stream.read(block_size)
+            if not block or len(block) < block_size:
+                break
+            self._peak, self._rms = block_levels(block)
+        stream.close()
+        process.wait()
+
+    def _on_tick(self, widget, frame_clock) -> bool:
+        now = time.monotonic()
+        if now - self._last_frame < 1 / MAX_FPS:
+            return True
+        self._last_frame = now
+
+        self._shown_peak = max(to_meter(self._peak), self._shown_peak * PEAK_DECAY)
+        self._rms_bar.set_value(to_meter(self._rms))
+        self._peak_bar.set_value(self._shown_peak)
+        return True
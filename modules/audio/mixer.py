@@ -0,0 +1,196 @@
+from ignis.widgets import Widget
+from ignis.services.audio import AudioService, Stream
+
+from .volume import VolumeSlider
+
+
+class MixerRow(Widget.Box):
+    """
+    A single application stream with its volume slider and mute button.
+    Rows are rebound to new streams instead of being rebuilt.
+    """
+
+    def __init__(self, stream: Stream):
+        self._stream = stream
+        self._handlers: list[int] = []
+
+        self._icon = Widget.Icon(pixel_size=20, css_classes=["mixer-app-icon"])
+        self._label = Widget.Label(
+            ellipsize="end",
+            max_width_chars=24,
+            halign="start",
+            hexpand=True,
+            css_classes=["mixer-app-name"],
+        )
+        self._mute_icon = Widget.Icon(pixel_size=16)
+        self._mute_button = Widget.Button(
+            child=self._mute_icon,
+            css_classes=["mixer-mute"],
+            on_click=lambda x: self._toggle_mute(),
+        )
+        self._slider = VolumeSlider(stream=stream)
+
+        super().__init__(
+            vertical=True,
+            css_classes=["mixer-row"],
+            child=[
+                Widget.Box(
+                    spacing=8,
+                    child=[self._icon, self._label, self._mute_button],
+                ),
+                self._slider,
+            ],
+        )
+
+        self._connect_stream()
+        self._refresh()
+
+    @property
+    def stream(self) -> Stream:
+        return self._stream
+
+    def bind(self, stream: Stream) -> None:
+        self.unbind()
+        self._stream = stream
+        self._slider.bind_stream(stream)
+        self._connect_stream()
+        self._refresh()
+
+    def unbind(self) -> None:
+        """Stop following the stream, the row keeps its last state."""
+        for handler in self._handlers:
+            self._stream.disconnect(handler)
+        self._handlers.clear()
+        self._slider.teardown()
+
+    def _connect_stream(self):
+        self._handlers = [
+            self._stream.connect("notify::is-muted", lambda *_: self._refresh()),
+            self._stream.connect("notify::description", lambda *_: self._refresh()),
+            self._stream.connect("notify::icon-name", lambda *_: self._refresh()),
+        ]
+
+    def _refresh(self):
+        stream = self._stream
+        self._label.label = stream.description or stream.name or "Unknown"
+        self._icon.image = stream.icon_name or "audio-x-generic-symbolic"
+        self._mute_icon.image = (
+            "audio-volume-muted-symbolic"
+            if stream.is_muted
+            else "audio-volume-high-symbolic"
+        )
+        if stream.is_muted:
+            self.add_css_class("muted")
+        else:
+            self.remove_css_class("muted")
+
+    def _toggle_mute(self):
+        self._stream.is_muted = not self._stream.is_muted
+
+
+class AppMixer(Widget.Box):
+    """
+    Per-application playback streams from the AudioService.
+
+    Rows are keyed by stream id and recycled as streams come and go. Nothing
+    is updated while the mixer is not mapped; the rows are reconciled with
+    ``AudioService.apps`` when it is shown again.
+    """
+
+    __gtype_name__ = "AppMixer"
+
+    def __init__(self):
+        self.audio = AudioService.get_default()
+        self._rows: dict[int, MixerRow] = {}
+        self._free_rows: list[MixerRow] = []
+        self._removed_handlers: dict[int, int] = {}
+        self._active = False
+
+        self._empty_label = Widget.Label(
+            label="No applications playing audio",
+            css_classes=["mixer-empty-label"],
+        )
+
+        super().__init__(
+            vertical=True,
+            spacing=10,
+            css_classes=["app-mixer"],
+            child=[self._empty_label],
+        )
+
+        self._added_handler = self.audio.connect("app-added", self._on_app_added)
+        self.connect("map", lambda x: self._activate())
+        self.connect("unmap", lambda x: self._deactivate())
+
+    def teardown(self) -> None:
+        self._deactivate()
+        if self._added_handler is not None:
+            self.audio.disconnect(self._added_handler)
+            self._added_handler = None
+
+    def _activate(self):
+        if self._active:
+            return
+        self._active = True
+
+        streams = {stream.id: stream for stream in self.audio.apps}
+        for stream_id in list(self._rows):
+            if stream_id not in streams:
+                self._release(stream_id)
+        for stream in streams.values():
+            self._show_stream(stream)
+        self._update_empty_label()
+
+    def _deactivate(self):
+        if not self._active:
+            return
+        self._active = False
+        for stream_id, row in self._rows.items():
+            row.stream.disconnect(self._removed_handlers.pop(stream_id))
+            row.unbind()
+
+    def _on_app_added(self, service, stream: Stream):
+        # Closed panel: the stream is picked up from audio.apps when shown
+        if not self._active:
+            return
+        self._show_stream(stream)
+        self._update_empty_label()
+
+    def _show_stream(self, stream: Stream):
+        handler = self._removed_handlers.pop(stream.id, None)
+        if handler is not None:
+            self._rows[stream.id].stream.disconnect(handler)
+
+        row = self._rows.get(stream.id)
+        if row is not None:
+            row.bind(stream)
+        elif self._free_rows:
+            row = self._free_rows.pop()
+            row.bind(stream)
+            row.visible = True
+            self._rows[stream.id] = row
+        else:
+            row = MixerRow(stream)
+            self.append(row)
+            self._rows[stream.id] = row
+
+        self._removed_handlers[stream.id] = stream.connect(
+            "removed", lambda x, stream_id=stream.id: self._on_stream_removed(stream_id)
+        )
+
+    def _on_stream_removed(self, stream_id: int):
+        row = self._rows.get(stream_id)
+        if row is None:
+            return
+        row.stream.disconnect(self._removed_handlers.pop(stream_id))
+        row.unbind()
+        self._release(stream_id)
+        self._update_empty_label()
+
+    def _release(self, stream_id: int):
+        row = self._rows.pop(stream_id)
+        row.visible = False
+        self._free_rows.append(row)
+
+    def _update_empty_label(self):
+        self._empty_label.visible = len(self._rows) == 0
@@ -1,7 +1,17 @@
+import time
+
 from ignis.widgets import Widget
+from ignis.utils import Utils
 from ignis.services.audio import AudioService
 from gi.repository import Gtk
 
+# Minimum time between two volume writes while dragging a slider (ms)
+WRITE_INTERVAL = 50
+# How long after the last slider movement stream updates are treated as echoes (ms)
+ECHO_GUARD = 250
+# How long a collapsed VolumeRevealer keeps its slider around (ms)
+SLIDER_IDLE_TIMEOUT = 30_000
+
 
 class Volume(Widget.Box):
     def __init__(self):
@@ -15,42 +25,162 @@ class Volume(Widget.Box):
         self.add_css_class("volume")
 
     def _setup_bindings(self):
-        self.icon = Widget.Icon(
-            image=self.audio.speaker.bind("icon_name"), style="margin-right: 5px;"
-        )
-        self.label_volume = Widget.Label(
-            label=self.audio.speaker.bind("volume", transform=lambda value: str(value))
-        )
+        # Handlers rather than binds, so teardown can let go of the speaker
+        self._speaker = self.audio.speaker
+        self.icon = Widget.Icon(style="margin-right: 5px;")
+        self.label_volume = Widget.Label()
+        self._handlers = [
+            self._speaker.connect("notify::icon-name", lambda *_: self._update()),
+            self._speaker.connect("notify::volume", lambda *_: self._update()),
+        ]
+        self._update()
+
+    def _update(self):
+        self.icon.image = self._speaker.icon_name
+        self.label_volume.label = str(self._speaker.volume)
+
+    def teardown(self):
+        for handler in self._handlers:
+            self._speaker.disconnect(handler)
+        self._handlers = []
 
 
 class VolumeSlider(Widget.Scale):
-    def __init__(self):
+    """
+    A volume slider that throttles writes to the audio server.
+
+    While dragging, at most one ``set_volume`` call is made per
+    ``write_interval`` ms and the final value is always delivered. Volume
+    notifications echoed back from our own writes are ignored during a drag.
+    """
+
+    def __init__(self, stream=None, write_interval: int = WRITE_INTERVAL):
         self.audio = AudioService.get_default()
-        self._setup_bindings()
+        self._stream = stream or self.audio.speaker
+        self._write_interval = write_interval
+
+        self._pending_value = None
+        self._last_written = None
+        self._last_write_time = 0.0
+        self._last_user_change = 0.0
+        self._write_timeout = None
+        self._resync_timeout = None
+        self._syncing = False
 
         super().__init__(
             min=0,
             max=100,
             step=1,
-            value=self.volume,
+            value=self._stream.volume,
             on_change=self._on_volume_change,
         )
 
+        self._volume_handler = self._stream.connect(
+            "notify::volume", self._on_stream_volume
+        )
+
         self.add_css_class("volume-slider")
 
-    def _setup_bindings(self):
-        self.volume = self.audio.speaker.bind("volume")
+    def bind_stream(self, stream) -> None:
+        """
+        Point the slider at another stream, reusing the widget.
+        """
+        self.teardown()
+        self._stream = stream
+        self._last_user_change = 0.0
+        self._volume_handler = stream.connect("notify::volume", self._on_stream_volume)
+        self._sync_from_stream()
 
     def _on_volume_change(self, slider):
-        (self.audio.speaker.set_volume(slider.value),)
+        # Ignore changes we made ourselves while syncing from the stream
+        if self._syncing:
+            return
+
+        self._pending_value = round(slider.value)
+        self._last_user_change = time.monotonic()
+        if self._write_timeout is not None:
+            return
+
+        elapsed = (self._last_user_change - self._last_write_time) * 1000
+        if elapsed >= self._write_interval:
+            self._flush()
+        else:
+            self._write_timeout = Utils.Timeout(
+                int(self._write_interval - elapsed), self._flush
+            )
+
+    def _flush(self):
+        self._write_timeout = None
+        value, self._pending_value = self._pending_value, None
+        if value is None or value == self._last_written:
+            return
+
+        self._last_written = value
+        self._last_write_time = time.monotonic()
+        self._stream.set_volume(value)
+
+        # Pick up the real volume once the echoes of this drag have settled
+        if self._resync_timeout is not None:
+            self._resync_timeout.cancel()
+        self._resync_timeout = Utils.Timeout(ECHO_GUARD, self._resync)
+
+    def _is_dragging(self) -> bool:
+        return (time.monotonic() - self._last_user_change) * 1000 < ECHO_GUARD
+
+    def _on_stream_volume(self, stream, pspec):
+        if self._is_dragging():
+            return
+        self._sync_from_stream()
+
+    def _resync(self):
+        self._resync_timeout = None
+        if self._is_dragging():
+            self._resync_timeout = Utils.Timeout(ECHO_GUARD, self._resync)
+            return
+        self._sync_from_stream()
+
+    def teardown(self):
+        """
+        Deliver any pending write and disconnect from the stream.
+        """
+        if self._write_timeout is not None:
+            self._write_timeout.cancel()
+            self._flush()
+        if self._resync_timeout is not None:
+            self._resync_timeout.cancel()
+            self._resync_timeout = None
+        if self._volume_handler is not None:
+            self._stream.disconnect(self._volume_handler)
+            self._volume_handler = None
+
+    def _sync_from_stream(self):
+        # Someone else may have changed the volume since our last write
+        self._last_written = None
+        volume = self._stream.volume
+        if volume is None or round(volume) == round(self.value):
+            return
+        self._syncing = True
+        try:
+            self.value = volume
+        finally:
+            self._syncing = False
 
 
 class VolumeRevealer(Widget.Box):
-    def __init__(self):
+    """
+    Shows a VolumeSlider next to the volume label on hover.
+
+    The slider is only built on the first hover and dropped again once the
+    revealer has been collapsed for ``slider_idle_timeout`` ms, so hidden
+    bars do not follow every volume change.
+    """
+
+    def __init__(self, slider_idle_timeout: int = SLIDER_IDLE_TIMEOUT):
         self.volume = Volume()
-        self._slider = VolumeSlider()
+        self._slider = None
+        self._slider_idle_timeout = slider_idle_timeout
+        self._drop_timeout = None
         self._revealer = Widget.Revealer(
-            child=self._slider,
             reveal_child=False,
             transition_type="slide_left",
             transition_duration=500
@@ -80,7 +210,36 @@ class VolumeRevealer(Widget.Box):
         motion_controller.connect("leave", self._on_hover_leave)
         
     def _on_hover_enter(self, controller, x, y):
+        if self._drop_timeout is not None:
+            self._drop_timeout.cancel()
+            self._drop_timeout = None
+        if self._slider is None:
+            self._slider = VolumeSlider()
+            self._revealer.child = self._slider
         self._revealer.set_reveal_child(True)
         
     def _on_hover_leave(self, controller):
         self._revealer.set_reveal_child(False)
+        if self._slider is not None and self._drop_timeout is None:
+            self._drop_timeout = Utils.Timeout(
+                max(self._slider_idle_timeout, self._revealer.transition_duration),
+                self._drop_slider,
+            )
+
+    def _drop_slider(self):
+        self._drop_timeout = None
+        if self._slider is None or self._revealer.reveal_child:
+            return
+        self._slider.teardown()
+        self._revealer.child = None
+        self._slider = None
+
+    def teardown(self):
+        if self._drop_timeout is not None:
+            self._drop_timeout.cancel()
+            self._drop_timeout = None
+        self.volume.teardown()
+        if self._slider is not None:
+            self._slider.teardown()
+            self._revealer.child = None
+            self._slider = None
@@ -1,3 +1,4 @@
 from .bar import Bar
+from .layout import BarLayout
 
-__all__ =["Bar"]
+__all__ =["Bar", "BarLayout"]
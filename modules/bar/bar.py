@@ -1,27 +1,18 @@
 import datetime
 import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
 from ignis.widgets import Widget
 from ignis.utils import Utils
-from ignis.services.notifications import NotificationService
-from ignis.services.mpris import MprisService, MprisPlayer
-
-from modules import (
-    PriceTracker,
-    Battery,
-    Tray,
-    Workspaces,
-    WindowTitle,
-    Volume,
-    VolumeSlider,
-    VolumeRevealer,
-    PowerMenu,
-    NotificationIcon,
-)
-
-mpris = MprisService.get_default()
-
-
-def mpris_title(player: MprisPlayer) -> Widget.Box:
+
+from .layout import SECTIONS, BarLayout, options_key
+
+if TYPE_CHECKING:
+    from ignis.services.mpris import MprisPlayer
+
+
+def mpris_title(player: "MprisPlayer") -> Widget.Box:
     return Widget.Box(
         spacing=10,
         setup=lambda self: player.connect(
@@ -40,6 +31,10 @@ def mpris_title(player: MprisPlayer) -> Widget.Box:
 
 
 def media() -> Widget.Box:
+    # The MPRIS service is started only when a media widget is built
+    from ignis.services.mpris import MprisService
+
+    mpris = MprisService.get_default()
     return Widget.Box(
         spacing=10,
         child=[
@@ -53,89 +48,224 @@ def media() -> Widget.Box:
         ),
     )
 
-def clock() -> Widget.Label:
-    # poll for current time every second
-    return Widget.Label(
-        css_classes=["clock"],
-        label=Utils.Poll(
-            1_000, lambda self: datetime.datetime.now().strftime("%H:%M")
-        ).bind("output"),
-    )
+class Clock(Widget.Label):
+    __gtype_name__ = "BarClock"
+
+    def __init__(self, time_format: str = "%H:%M"):
+        # poll for current time every second
+        self._poll = Utils.Poll(
+            1_000, lambda x: datetime.datetime.now().strftime(time_format)
+        )
+        super().__init__(css_classes=["clock"], label=self._poll.bind("output"))
 
+    def teardown(self):
+        self._poll.cancel()
+
+
+def price_tracker(contracts: list[str]) -> Widget.Box:
+    # Pulls in aiohttp and requests, keep it out of startup unless used
+    from modules import PriceTracker
 
-def price_tracker() -> Widget.Box:
     return Widget.Box(
-        child=[
-            # PriceTracker("b5w7qrbhbdu2jehgvrhbw7xgmtkc4i4fbj4gs9udwldm"),
-            # PriceTracker("fe5d1suzpldryy6f87lgacrbukstrx9jsmg1a1bpsplt")
-        ],
+        child=[PriceTracker(contract) for contract in contracts],
         spacing=10,
     )
 
 
-def left(monitor_name: str) -> Widget.Box:
-    return Widget.Box(
-        child=[Workspaces(monitor_name), WindowTitle(monitor_name)], spacing=10
-    )
+def _build_module(name: str, monitor_name: str, options: dict[str, Any]):
+    # Modules are imported through the lazy registry, only when a layout
+    # actually uses them
+    import modules
 
+    factories: dict[str, Callable[[], Any]] = {
+        "workspaces": lambda: modules.Workspaces(monitor_name),
+        "window_title": lambda: modules.WindowTitle(monitor_name),
+        "tray": lambda: modules.Tray(),
+        "battery": lambda: modules.Battery(),
+        "volume": lambda: modules.Volume(),
+        "volume_slider": lambda: modules.VolumeSlider(),
+        "volume_revealer": lambda: modules.VolumeRevealer(),
+        "level_meter": lambda: modules.LevelMeter(device=options.get("device")),
+        "notification_icon": lambda: modules.NotificationIcon(),
+        "clock": lambda: Clock(options.get("format", "%H:%M")),
+        "media": media,
+        "price_tracker": lambda: price_tracker(options.get("contracts", [])),
+        "power_menu": lambda: modules.PowerMenu(),
+    }
 
-def center() -> Widget.Box:
-    return Widget.Box(
-        child=[
-            # Widget.Separator(vertical=True, css_classes=["middle-separator"]),
-        ],
-        spacing=10,
-    )
+    factory = factories.get(name)
+    if factory is None:
+        print(f"Unknown bar module: {name}")
+        return None
+    try:
+        return factory()
+    except Exception as e:
+        print(f"Error creating bar module {name}: {e}")
+        return None
 
 
-async def right() -> Widget.Box:
-    battery_widget = Battery()
-    await battery_widget.setup()
+def _needs_setup(module) -> bool:
+    return asyncio.iscoroutinefunction(getattr(module, "setup", None))
 
-    tray_widget = Tray()
-    await tray_widget.setup()
 
-    return Widget.Box(
-        child=[
-            # price_tracker(),
-            tray_widget,
-            battery_widget,
-            # Volume(),
-            # VolumeSlider(),
-            VolumeRevealer(),
-            NotificationIcon(),
-            clock(),
-            PowerMenu(),
-        ],
-        spacing=10,
-    )
+def _teardown_module(module) -> None:
+    teardown = getattr(module, "teardown", None)
+    if teardown is not None:
+        teardown()
+
+
+async def _timed_setup(module) -> tuple[str, float]:
+    name = type(module).__name__
+    started = time.perf_counter()
+    try:
+        await module.setup()
+    except Exception as e:
+        print(f"Error setting up {name}: {e}")
+    return name, (time.perf_counter() - started) * 1000
 
 
 class Bar(Widget.Window):
     __gtype_name__ = "Bar"
 
-    def __init__(self, monitor_id: int = 0):
+    def __init__(
+        self,
+        monitor_id: int = 0,
+        output: str | None = None,
+        layout: BarLayout | None = None,
+    ):
         self.monitor_id = monitor_id
-        self.monitor_name = None
+        self.monitor_name = output
+        self._layout = layout or BarLayout.get_default()
+        self._layout_handler = None
+        # One box per section; module instances are kept by name and options
+        # so a layout reload only touches what changed
+        self._sections = {section: Widget.Box(spacing=10) for section in SECTIONS}
+        self._section_keys: dict[str, list[str]] = {}
+        self._instances: dict[str, Any] = {}
+        self._setup_started = 0.0
+        self._first_frame_ms: float | None = None
+        self._populated_ms: float | None = None
+        self._module_times: list[tuple[str, float]] = []
 
         super().__init__(
-            namespace=f"ignis_bar_{monitor_id}",
+            # Named after the output when known, indices shift on hotplug
+            namespace=f"ignis_bar_{output or monitor_id}",
             monitor=monitor_id,
             anchor=["left", "bottom", "right"],
             exclusivity="exclusive",
             child=Widget.CenterBox(
                 css_classes=["bar"],
-                start_widget=None,
-                center_widget=None,
-                end_widget=None,
+                start_widget=self._sections["left"],
+                center_widget=self._sections["center"],
+                end_widget=self._sections["right"],
             ),
         )
+
     async def setup(self):
-        self.monitor_name = Utils.get_monitor(self.monitor_id).get_connector()  # type: ignore
-        start_widget = left(self.monitor_name)
-        center_widget = center()
-        end_widget = await right()
-
-        self.child.start_widget = start_widget
-        self.child.center_widget = center_widget
-        self.child.end_widget = end_widget
+        self._setup_started = time.perf_counter()
+        if self.monitor_name is None:
+            self.monitor_name = Utils.get_monitor(self.monitor_id).get_connector()  # type: ignore
+
+        # Show every section at once, async modules fill in afterwards
+        pending = self._apply_layout()
+        self.child.add_tick_callback(self._on_first_frame)
+        if self._layout_handler is None:
+            self._layout_handler = self._layout.connect(
+                "changed", lambda x: self._on_layout_changed()
+            )
+
+        self._module_times = list(
+            await asyncio.gather(*(_timed_setup(module) for module in pending))
+        )
+        self._populated_ms = self._elapsed()
+        self._print_report()
+
+    def _apply_layout(self) -> list:
+        """
+        Rebuild the sections whose modules changed, reusing instances.
+        Returns the new modules that still need their async setup().
+        """
+        resolved = self._layout.resolve(self.monitor_name)
+        keys = {
+            section: [options_key(name, options) for name, options in modules]
+            for section, modules in resolved.items()
+        }
+        changed = [s for s in SECTIONS if keys[s] != self._section_keys.get(s)]
+
+        # Empty the changed sections first, so modules can move between them
+        for section in changed:
+            self._sections[section].child = []
+
+        placed = {k for s in SECTIONS if s not in changed for k in keys[s]}
+        pending = []
+        for section in changed:
+            widgets = []
+            for (name, options), key in zip(resolved[section], keys[section]):
+                if key in placed:
+                    print(f"Bar module {name} is listed more than once")
+                    continue
+                widget = self._instances.get(key)
+                if widget is None:
+                    widget = _build_module(name, self.monitor_name, options)
+                    if widget is None:
+                        continue
+                    self._instances[key] = widget
+                    if _needs_setup(widget):
+                        pending.append(widget)
+                placed.add(key)
+                widgets.append(widget)
+            self._sections[section].child = widgets
+
+        # Let go of modules the layout no longer uses
+        for key in [k for k in self._instances if k not in placed]:
+            _teardown_module(self._instances.pop(key))
+
+        self._section_keys = keys
+        return pending
+
+    def _on_layout_changed(self):
+        pending = self._apply_layout()
+        if pending:
+            asyncio.create_task(self._setup_modules(pending))
+
+    async def _setup_modules(self, pending: list) -> None:
+        for name, ms in await asyncio.gather(*(_timed_setup(m) for m in pending)):
+            print(f"Bar {self.monitor_name}: {name} set up in {ms:.1f} ms")
+
+    def set_monitor(self, monitor: int | None) -> None:
+        """Move to another monitor index, or hide while the output is gone."""
+        if monitor is None:
+            self.visible = False
+            return
+        self.monitor_id = monitor
+        self.monitor = monitor
+        self.visible = True
+
+    def teardown(self) -> None:
+        """Let go of the layout and every module, call before ``destroy``."""
+        if self._layout_handler is not None:
+            self._layout.disconnect(self._layout_handler)
+            self._layout_handler = None
+        for box in self._sections.values():
+            box.child = []
+        for module in self._instances.values():
+            _teardown_module(module)
+        self._instances.clear()
+        self._section_keys = {}
+
+    def _elapsed(self) -> float:
+        return (time.perf_counter() - self._setup_started) * 1000
+
+    def _on_first_frame(self, widget, frame_clock) -> bool:
+        self._first_frame_ms = self._elapsed()
+        self._print_report()
+        return False
+
+    def _print_report(self):
+        if self._first_frame_ms is None or self._populated_ms is None:
+            return
+        details = ", ".join(f"{name} {ms:.1f} ms" for name, ms in self._module_times)
+        print(
+            f"Bar {self.monitor_name}: first frame {self._first_frame_ms:.1f} ms,"
+            f" fully populated {self._populated_ms:.1f} ms ({details})"
+        )
@@ -0,0 +1,153 @@
+import copy
+import json
+import tomllib
+from typing import Any
+
+from gi.repository import GObject  # type: ignore
+from ignis.gobject import IgnisGObject
+from ignis.utils import Utils
+
+SECTIONS = ("left", "center", "right")
+# Used when no layout file is given or it cannot be read
+DEFAULT_LAYOUT: dict[str, Any] = {
+    "bar": {
+        "left": ["workspaces", "window_title"],
+        "center": [],
+        "right": [
+            "tray",
+            "battery",
+            "volume_revealer",
+            "notification_icon",
+            "clock",
+            "power_menu",
+        ],
+    },
+    "modules": {},
+    "monitors": {},
+}
+# Editors write a file in several steps, wait for them to settle (ms)
+RELOAD_DELAY = 200
+
+# A resolved section: (module name, options) pairs in display order
+Section = list[tuple[str, dict[str, Any]]]
+
+
+def _read(path: str) -> dict[str, Any]:
+    with open(path, "rb") as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        return tomllib.load(f)
+
+
+def _validate(layout: dict[str, Any]) -> None:
+    for key in ("bar", "monitors", "modules"):
+        if not isinstance(layout.get(key, {}), dict):
+            raise ValueError(f"'{key}' must be a table")
+    for key in ("monitors", "modules"):
+        for name, table in layout.get(key, {}).items():
+            if not isinstance(table, dict):
+                raise ValueError(f"'{key}.{name}' must be a table")
+
+    for table in [layout.get("bar", {}), *layout.get("monitors", {}).values()]:
+        for section in SECTIONS:
+            modules = table.get(section, [])
+            if not isinstance(modules, list) or not all(
+                isinstance(name, str) for name in modules
+            ):
+                raise ValueError(f"'{section}' must be a list of module names")
+
+
+def options_key(name: str, options: dict[str, Any]) -> str:
+    """A stable key for a module and its options, to reuse instances by."""
+    return f"{name}:{json.dumps(options, sort_keys=True)}"
+
+
+class BarLayout(IgnisGObject):
+    """
+    The bar layout, read from a TOML (or JSON) file:
+
+    .. code-block:: toml
+
+        [bar]
+        left = ["workspaces", "window_title"]
+        right = ["tray", "clock"]
+
+        [modules.price_tracker]
+        contracts = ["..."]
+
+        [monitors."HDMI-A-1"]
+        right = ["clock"]
+
+    ``monitors`` tables replace single sections of ``bar`` for one output.
+    Once ``watch`` is called the file is reloaded when it changes and
+    ``changed`` is emitted; bars then rebuild only the sections that differ.
+    """
+
+    _instance: "BarLayout | None" = None
+
+    def __init__(self):
+        super().__init__()
+        self._layout = copy.deepcopy(DEFAULT_LAYOUT)
+        self._path: str | None = None
+        self._monitor = None
+        self._reload_timeout = None
+
+    @classmethod
+    def get_default(cls) -> "BarLayout":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @GObject.Signal
+    def changed(self): ...
+
+    def watch(self, path: str) -> None:
+        """Load the layout from ``path`` and follow later edits of it."""
+        self._path = path
+        self._load()
+        if self._monitor is None:
+            self._monitor = Utils.FileMonitor(
+                path=path,
+                callback=lambda *_: self.__queue_reload(),
+            )
+
+    def resolve(self, monitor_name: str | None) -> dict[str, Section]:
+        """The modules of every section for one output."""
+        bar = self._layout.get("bar", {})
+        override = self._layout.get("monitors", {}).get(monitor_name or "", {})
+        module_options = self._layout.get("modules", {})
+        return {
+            section: [
+                (name, module_options.get(name, {}))
+                for name in override.get(section, bar.get(section, []))
+            ]
+            for section in SECTIONS
+        }
+
+    def _load(self) -> bool:
+        if self._path is None:
+            return False
+        try:
+            layout = _read(self._path)
+            _validate(layout)
+        except FileNotFoundError:
+            print(f"Bar layout {self._path} not found, using the default layout")
+            return False
+        except (OSError, ValueError, tomllib.TOMLDecodeError) as e:
+            print(f"Error reading bar layout {self._path}: {e}")
+            return False
+        self._layout = layout
+        return True
+
+    def __queue_reload(self) -> None:
+        if self._reload_timeout is not None:
+            self._reload_timeout.cancel()
+        self._reload_timeout = Utils.Timeout(RELOAD_DELAY, self.__reload)
+
+    def __reload(self) -> None:
+        self._reload_timeout = None
+        previous = self._layout
+        # A broken edit keeps the last good layout on screen
+        if self._load() and self._layout != previous:
+            print(f"Bar layout reloaded from {self._path}")
+            self.emit("changed")
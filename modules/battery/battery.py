@@ -82,6 +82,7 @@ class Battery(Widget.Box):
         
         self.add_css_class("battery-module")
         self._is_setup = False
+        self._update_task: Optional[asyncio.Task] = None
         
         self._update_menu_highlighting()
         
@@ -129,8 +130,8 @@ class Battery(Widget.Box):
     async def setup(self):
         if self._is_setup:
             return
-        await self._load_power_profile()
-        await self._update_battery()
+        # The profile query and the sysfs reads do not depend on each other
+        await asyncio.gather(self._load_power_profile(), self._update_battery())
         self._is_setup = True
 
     async def __post_init__(self):
@@ -139,12 +140,20 @@ class Battery(Widget.Box):
     def on_map(self):
         """Called when the widget is mapped."""
         super().on_map()
-        asyncio.create_task(self.start_periodic_updates())
+        # Mapping again must not start a second update loop
+        if self._update_task is None or self._update_task.done():
+            self._update_task = asyncio.create_task(self.start_periodic_updates())
         
     def on_unmap(self):
         """Called when the widget is unmapped."""
         super().on_unmap()
         
+    def teardown(self):
+        """Stop the periodic updates."""
+        if self._update_task is not None:
+            self._update_task.cancel()
+            self._update_task = None
+
     def _get_battery_icon(self, percentage: int, charging: bool) -> str:
         """Get the appropriate battery icon based on percentage and charging status."""
         if charging:
@@ -219,8 +228,11 @@ class Battery(Widget.Box):
     async def _update_battery(self):
         """Update the battery display."""
         try:
-            percentage = int(await self._read_file_async("/sys/class/power_supply/BAT1/capacity"))
-            status = await self._read_file_async("/sys/class/power_supply/BAT1/status")
+            capacity, status = await asyncio.gather(
+                self._read_file_async("/sys/class/power_supply/BAT1/capacity"),
+                self._read_file_async("/sys/class/power_supply/BAT1/status"),
+            )
+            percentage = int(capacity)
             charging = status == "Charging"
             
             # Update icon and percentage
@@ -1,4 +1,5 @@
 from .control_center import ControlCenter
 from .notification_menu import NotificationCenter
+from .history import NotificationHistory
 
-__all__ = ['ControlCenter', 'NotificationCenter']
+__all__ = ['ControlCenter', 'NotificationCenter', 'NotificationHistory']
@@ -1,25 +1,32 @@
 from ignis.widgets import Widget
 from ignis.app import IgnisApp
+from ignis.utils import Utils
 from .notification_menu import NotificationCenter
+from ..audio import AppMixer
 
 app = IgnisApp.get_default()
 
+# How long the panel content is kept after the panel was closed (ms)
+CONTENT_IDLE_TIMEOUT = 120_000
+
+
 class ControlCenter(Widget.RevealerWindow):
-    def __init__(self):
+    """
+    The window itself is cheap and exists from startup so it can be toggled.
+    Its content is only built when the panel is first shown, and freed again
+    once it has been closed for ``content_idle_timeout`` ms.
+    """
+
+    def __init__(self, content_idle_timeout: int = CONTENT_IDLE_TIMEOUT):
+        self._content_idle_timeout = content_idle_timeout
+        self._teardown_timeout = None
+        self._mixer: AppMixer | None = None
+        self._notification_center: NotificationCenter | None = None
+
+        self._content = Widget.Box(vertical=True, css_classes=["control-center"])
         revealer = Widget.Revealer(
             transition_type="slide_left",
-            child=Widget.Box(
-                vertical=True,
-                css_classes=["control-center"],
-                child=[
-                    Widget.Box(
-                        vertical=True,
-                        css_classes=["control-center-widget"],
-                        child=[],
-                    ),
-                    NotificationCenter(),
-                ],
-            ),
+            child=self._content,
             transition_duration=300,
             reveal_child=True,
         )
@@ -47,3 +54,40 @@ class ControlCenter(Widget.RevealerWindow):
             ),
             revealer=revealer,
         )
+
+        self.connect("notify::visible", lambda *_: self._on_visible_changed())
+
+    def _on_visible_changed(self):
+        if self.visible:
+            if self._teardown_timeout is not None:
+                self._teardown_timeout.cancel()
+                self._teardown_timeout = None
+            self._build_content()
+        elif self._notification_center is not None and self._teardown_timeout is None:
+            self._teardown_timeout = Utils.Timeout(
+                self._content_idle_timeout, self._teardown_content
+            )
+
+    def _build_content(self):
+        if self._notification_center is not None:
+            return
+        self._mixer = AppMixer()
+        self._notification_center = NotificationCenter()
+        self._content.child = [
+            Widget.Box(
+                vertical=True,
+                css_classes=["control-center-widget"],
+                child=[self._mixer],
+            ),
+            self._notification_center,
+        ]
+
+    def _teardown_content(self):
+        self._teardown_timeout = None
+        if self.visible or self._notification_center is None:
+            return
+        self._mixer.teardown()
+        self._notification_center.teardown()
+        self._content.child = []
+        self._mixer = None
+        self._notification_center = None
@@ -0,0 +1,410 @@
+import os
+import sqlite3
+import weakref
+
+from gi.repository import GObject  # type: ignore
+from ignis.gobject import IgnisGObject
+from ignis.services.notifications import Notification, NotificationService
+
+notifications = NotificationService.get_default()
+
+HISTORY_DB = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "ignis-rek",
+    "notifications.db",
+)
+# Notifications fetched per page in the notification center
+PAGE_SIZE = 50
+# Compaction keeps this many of the newest notifications
+MAX_HISTORY = 5000
+# Inserts between two compactions
+COMPACT_EVERY = 200
+
+_COLUMNS = "rowid, notification_id, app_name, app_icon, icon, summary, body, time"
+
+
+def _sync_key(notification_id: int | None, stored_time: float | None) -> tuple:
+    # Times are compared to the millisecond, the stored REAL may round
+    return notification_id, round((stored_time or 0) * 1000)
+
+
+class HistoryEntry(IgnisGObject):
+    """
+    A stored notification. Has the fields ``NotificationWidget`` reads from a
+    ``Notification``; actions are only available while the original
+    notification is still alive.
+    """
+
+    def __init__(self, history: "NotificationHistory", row: tuple):
+        super().__init__()
+        self._history = history
+        (
+            self.rowid,
+            self.id,
+            self.app_name,
+            self.app_icon,
+            self.icon,
+            self.summary,
+            self.body,
+            self.time,
+        ) = row
+
+    @GObject.Signal
+    def closed(self): ...
+
+    @property
+    def live(self) -> Notification | None:
+        return self._history.get_live(self.rowid)
+
+    @property
+    def actions(self) -> list:
+        live = self.live
+        return live.actions if live is not None else []
+
+    def close(self) -> None:
+        live = self.live
+        if live is not None:
+            live.close()
+        else:
+            self._history.remove(self)
+
+
+class NotificationHistory(IgnisGObject):
+    """
+    An on-disk notification history backed by SQLite.
+
+    New notifications are appended as they arrive and deleted when closed;
+    on startup the rows are relinked to the notifications the service
+    restored, so the store mirrors the service.
+    The store is compacted to ``MAX_HISTORY`` entries and compaction closes
+    the notifications it evicts, so neither the store nor the service grows
+    past that. Views read entries back newest first in pages.
+    """
+
+    _instance: "NotificationHistory | None" = None
+
+    def __init__(self, path: str = HISTORY_DB):
+        super().__init__()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._setup_db()
+
+        # rowid -> live Notification, and the handler watching it close
+        self._live: dict[int, Notification] = {}
+        self._live_handlers: dict[int, int] = {}
+        # Entries handed out to views, so removals reach the same objects
+        self._entries: weakref.WeakValueDictionary[int, HistoryEntry] = (
+            weakref.WeakValueDictionary()
+        )
+        self._inserts_since_compact = 0
+        self._count = self._db.execute("SELECT COUNT(*) FROM notifications").fetchone()[0]
+
+        self._sync_with_service()
+        self._compact()
+
+        notifications.connect("notified", lambda x, notification: self.append(notification))
+
+    @classmethod
+    def get_default(cls) -> "NotificationHistory":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @GObject.Signal(arg_types=(object,))
+    def added(self, entry): ...
+
+    @GObject.Signal(arg_types=(object,))
+    def removed(self, entry): ...
+
+    @GObject.Signal
+    def cleared(self): ...
+
+    @GObject.Property(type=int)
+    def count(self) -> int:
+        return self._count
+
+    def _setup_db(self) -> None:
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode this only syncs on checkpoints, not on every commit, so
+        # a notification flood does not fsync once per notification
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS notifications (
+                notification_id INTEGER,
+                app_name TEXT NOT NULL DEFAULT '',
+                app_icon TEXT NOT NULL DEFAULT '',
+                icon TEXT NOT NULL DEFAULT '',
+                summary TEXT NOT NULL DEFAULT '',
+                body TEXT NOT NULL DEFAULT '',
+                time REAL NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._fts = self._setup_search_index()
+        self._db.commit()
+
+    def _setup_search_index(self) -> bool:
+        """
+        Create the trigram full-text index, kept up to date by triggers.
+        Returns False when SQLite lacks FTS5 or the trigram tokenizer.
+        """
+        exists = self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'notifications_fts'"
+        ).fetchone()
+        try:
+            self._db.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS notifications_fts USING fts5(
+                    summary, body, app_name,
+                    content='notifications', content_rowid='rowid',
+                    tokenize='trigram'
+                )
+                """
+            )
+        except sqlite3.OperationalError as e:
+            print(f"Notification search index unavailable, falling back to scans: {e}")
+            return False
+
+        self._db.executescript(
+            """
+            CREATE TRIGGER IF NOT EXISTS notifications_fts_insert
+            AFTER INSERT ON notifications BEGIN
+                INSERT INTO notifications_fts(rowid, summary, body, app_name)
+                VALUES (new.rowid, new.summary, new.body, new.app_name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS notifications_fts_delete
+            AFTER DELETE ON notifications BEGIN
+                INSERT INTO notifications_fts(notifications_fts, rowid, summary, body, app_name)
+                VALUES ('delete', old.rowid, old.summary, old.body, old.app_name);
+            END;
+            """
+        )
+        if not exists:
+            # Index whatever was stored before the index existed
+            self._db.execute(
+                "INSERT INTO notifications_fts(notifications_fts) VALUES ('rebuild')"
+            )
+        return True
+
+    def _sync_with_service(self) -> None:
+        """
+        Link stored rows to the notifications the service restored, by id and
+        time. Restored notifications without a row are added; rows without a
+        notification were closed while we were not running and are dropped.
+        """
+        # Read the keys once and match in memory, one query per restored
+        # notification would scan the table each time
+        rows: dict[tuple[int, int], list[int]] = {}
+        for rowid, notification_id, stored_time in self._db.execute(
+            "SELECT rowid, notification_id, time FROM notifications ORDER BY rowid"
+        ):
+            rows.setdefault(_sync_key(notification_id, stored_time), []).append(rowid)
+
+        linked: set[int] = set()
+        existing = sorted(notifications.notifications, key=lambda n: n.time or 0)
+        for notification in existing:
+            candidates = rows.get(_sync_key(notification.id, notification.time))
+            if candidates:
+                rowid = candidates.pop()
+                self._link(rowid, notification)
+                linked.add(rowid)
+            else:
+                linked.add(self._insert(notification))
+
+        stale = [
+            rowid
+            for candidates in rows.values()
+            for rowid in candidates
+            if rowid not in linked
+        ]
+        self._db.executemany(
+            "DELETE FROM notifications WHERE rowid = ?", [(rowid,) for rowid in stale]
+        )
+        self._db.commit()
+        self._count = self._db.execute("SELECT COUNT(*) FROM notifications").fetchone()[0]
+
+    def _link(self, rowid: int, notification: Notification) -> None:
+        self._live[rowid] = notification
+        self._live_handlers[rowid] = notification.connect(
+            "closed", lambda x, rowid=rowid: self._on_live_closed(rowid)
+        )
+
+    def _insert(self, notification: Notification) -> int:
+        cursor = self._db.execute(
+            "INSERT INTO notifications "
+            "(notification_id, app_name, app_icon, icon, summary, body, time) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                notification.id,
+                notification.app_name or "",
+                notification.app_icon or "",
+                notification.icon or "",
+                notification.summary or "",
+                notification.body or "",
+                notification.time or 0,
+            ),
+        )
+        rowid = cursor.lastrowid
+        self._link(rowid, notification)
+        self._count += 1
+        return rowid
+
+    def append(self, notification: Notification) -> HistoryEntry:
+        rowid = self._insert(notification)
+        self._db.commit()
+        self.notify("count")
+
+        self._inserts_since_compact += 1
+        if self._inserts_since_compact >= COMPACT_EVERY:
+            self._compact()
+
+        entry = self._entry(self._fetch_row(rowid))
+        self.emit("added", entry)
+        return entry
+
+    def load_page(self, before: int | None = None, limit: int = PAGE_SIZE) -> list[HistoryEntry]:
+        """Newest entries first, older than the ``before`` rowid if given."""
+        if before is None:
+            rows = self._db.execute(
+                f"SELECT {_COLUMNS} FROM notifications ORDER BY rowid DESC LIMIT ?",
+                (limit,),
+            )
+        else:
+            rows = self._db.execute(
+                f"SELECT {_COLUMNS} FROM notifications WHERE rowid < ? "
+                "ORDER BY rowid DESC LIMIT ?",
+                (before, limit),
+            )
+        return [self._entry(row) for row in rows.fetchall()]
+
+    def search(
+        self, query: str, before: int | None = None, limit: int = PAGE_SIZE
+    ) -> list[HistoryEntry]:
+        """
+        Entries whose summary, body or app name contain every word of
+        ``query``, newest first and paged like ``load_page``.
+
+        Words of three or more characters are looked up in the trigram index,
+        shorter ones only filter the rows the index returned.
+        """
+        words = query.lower().split()
+        if not words:
+            return self.load_page(before, limit)
+
+        conditions: list[str] = []
+        params: list = []
+
+        indexed = [w for w in words if len(w) >= 3] if self._fts else []
+        if indexed:
+            conditions.append(
+                "rowid IN (SELECT rowid FROM notifications_fts "
+                "WHERE notifications_fts MATCH ?)"
+            )
+            params.append(" ".join('"' + w.replace('"', '""') + '"' for w in indexed))
+
+        for word in words:
+            if word in indexed:
+                continue
+            escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append(
+                "(summary || ' ' || body || ' ' || app_name) LIKE ? ESCAPE '\\'"
+            )
+            params.append(f"%{escaped}%")
+
+        if before is not None:
+            conditions.append("rowid < ?")
+            params.append(before)
+
+        rows = self._db.execute(
+            f"SELECT {_COLUMNS} FROM notifications WHERE {' AND '.join(conditions)} "
+            "ORDER BY rowid DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [self._entry(row) for row in rows.fetchall()]
+
+    @staticmethod
+    def matches(entry: HistoryEntry, query: str) -> bool:
+        """Check a single entry against ``query`` the same way ``search`` does."""
+        text = f"{entry.summary} {entry.body} {entry.app_name}".lower()
+        return all(word in text for word in query.lower().split())
+
+    def get_live(self, rowid: int) -> Notification | None:
+        return self._live.get(rowid)
+
+    def remove(self, entry: HistoryEntry) -> None:
+        self._delete(entry.rowid)
+
+    def clear(self) -> None:
+        self._db.execute("DELETE FROM notifications")
+        self._db.commit()
+        self._release_live(list(self._live))
+        self._count = 0
+        self.notify("count")
+        self.emit("cleared")
+
+    def _on_live_closed(self, rowid: int) -> None:
+        self._delete(rowid)
+
+    def _delete(self, rowid: int) -> None:
+        self._release_live([rowid])
+        cursor = self._db.execute("DELETE FROM notifications WHERE rowid = ?", (rowid,))
+        self._db.commit()
+        if cursor.rowcount == 0:
+            return
+
+        self._count -= cursor.rowcount
+        self.notify("count")
+        entry = self._entries.pop(rowid, None)
+        if entry is not None:
+            entry.emit("closed")
+            self.emit("removed", entry)
+
+    def _release_live(self, rowids: list[int]) -> None:
+        for rowid in rowids:
+            notification = self._live.pop(rowid, None)
+            handler = self._live_handlers.pop(rowid, None)
+            if notification is not None and handler is not None:
+                notification.disconnect(handler)
+
+    def _compact(self) -> None:
+        """Drop everything but the newest ``MAX_HISTORY`` entries."""
+        self._inserts_since_compact = 0
+        cutoff = self._db.execute(
+            "SELECT rowid FROM notifications ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+            (MAX_HISTORY,),
+        ).fetchone()
+        if cutoff is None:
+            return
+
+        cutoff = cutoff[0]
+        self._db.execute("DELETE FROM notifications WHERE rowid <= ?", (cutoff,))
+        self._db.commit()
+        self._db.execute("PRAGMA incremental_vacuum")
+
+        # Close the evicted notifications too, else the service keeps them in
+        # memory and its count drifts from ours
+        evicted = [rowid for rowid in self._live if rowid <= cutoff]
+        evicted_live = [self._live[rowid] for rowid in evicted]
+        self._release_live(evicted)
+        for notification in evicted_live:
+            notification.close()
+        self._count = self._db.execute("SELECT COUNT(*) FROM notifications").fetchone()[0]
+        self.notify("count")
+        for rowid in [rowid for rowid in self._entries.keys() if rowid <= cutoff]:
+            entry = self._entries.pop(rowid, None)
+            if entry is not None:
+                self.emit("removed", entry)
+
+    def _fetch_row(self, rowid: int) -> tuple:
+        return self._db.execute(
+            f"SELECT {_COLUMNS} FROM notifications WHERE rowid = ?", (rowid,)
+        ).fetchone()
+
+    def _entry(self, row: tuple) -> HistoryEntry:
+        entry = self._entries.get(row[0])
+        if entry is None:
+            entry = HistoryEntry(self, row)
+            self._entries[row[0]] = entry
+        return entry
@@ -1,35 +1,23 @@
 from ignis.widgets import Widget
 from ignis.services.notifications import NotificationService
 from ignis.app import IgnisApp
+from ..notification_popup.dnd import DndController
 
 app = IgnisApp.get_default()
 notifications = NotificationService.get_default()
+dnd = DndController.get_default()
 
 class NotificationIcon(Widget.Box):
     __gtype_name__ = "NotificationIcon"
 
     def __init__(self):
+        self._bell = Widget.Label(css_classes=["notification-bell"])
+        self._count = Widget.Label(css_classes=["notification-count"])
         self.button = Widget.Button(
-            child=Widget.Box(
-                child=[
-                    Widget.Label(
-                        label="󰂚",
-                        css_classes=["notification-bell"],
-                    ),
-                    Widget.Label(
-                        label=notifications.bind(
-                            "notifications",
-                            lambda value: str(len(value))
-                        ),
-                        visible=notifications.bind(
-                            "notifications",
-                            lambda value: len(value) > 0
-                        ),
-                        css_classes=["notification-count"],
-                    ),
-                ],
-            ),
+            child=Widget.Box(child=[self._bell, self._count]),
             on_click=self._toggle_notification_center,
+            # During do-not-disturb only the counter changes
+            on_right_click=lambda x: dnd.toggle(),
             css_classes=["notification-button"],
         )
 
@@ -38,9 +26,37 @@ class NotificationIcon(Widget.Box):
             child=[self.button],
         )
 
-        # Connect to window state changes
-        app.connect("window-added", self._on_window_state_changed)
-        app.connect("window-removed", self._on_window_state_changed)
+        # Handlers rather than binds, so teardown can disconnect them
+        self._handlers = [
+            (dnd, dnd.connect("notify::enabled", lambda *_: self._update_dnd())),
+            (
+                notifications,
+                notifications.connect(
+                    "notify::notifications", lambda *_: self._update_count()
+                ),
+            ),
+            # Connect to window state changes
+            (app, app.connect("window-added", self._on_window_state_changed)),
+            (app, app.connect("window-removed", self._on_window_state_changed)),
+        ]
+        self._update_dnd()
+        self._update_count()
+
+    def _update_dnd(self):
+        self._bell.label = "󰂛" if dnd.enabled else "󰂚"
+        self.button.tooltip_text = (
+            "Do not disturb" if dnd.enabled else "Notifications"
+        )
+
+    def _update_count(self):
+        count = len(notifications.notifications)
+        self._count.label = str(count)
+        self._count.visible = count > 0
+
+    def teardown(self):
+        for obj, handler in self._handlers:
+            obj.disconnect(handler)
+        self._handlers = []
 
     def _on_window_state_changed(self, app, window_name=None):
         if window_name == "ignis_CONTROL_CENTER":
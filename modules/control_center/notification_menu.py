@@ -1,79 +1,141 @@
 from ignis.widgets import Widget
-from ignis.services.notifications import Notification, NotificationService
-from ignis.utils import Utils
-from gi.repository import GLib  # type: ignore
+from ignis.services.notifications import NotificationService
+from gi.repository import Gio, Gtk  # type: ignore
 from ..utils import NotificationWidget
+from .history import HistoryEntry, NotificationHistory
+from ..notification_popup.dnd import DndController
 
 notifications = NotificationService.get_default()
+history = NotificationHistory.get_default()
+dnd = DndController.get_default()
 
 
-class Popup(Widget.Revealer):
-    def __init__(self, notification: Notification, **kwargs):
-        widget = NotificationWidget(notification)
-        super().__init__(child=widget, transition_type="slide_down", **kwargs)
+class NotificationList(Gtk.ListView):
+    """
+    A recycled list of stored notifications. Only the rows that are visible
+    get a NotificationWidget, which is rebound as rows scroll in and out.
 
-        notification.connect("closed", lambda x: self.destroy())
+    The newest page of the history is loaded first, older pages are fetched
+    with ``load_more`` as the list is scrolled.
+    """
 
-    def destroy(self):
-        self.reveal_child = False
-        Utils.Timeout(self.transition_duration, self.unparent)
-
-
-class NotificationList(Widget.Box):
     __gtype_name__ = "NotificationList"
 
     def __init__(self):
-        loading_notifications_label = Widget.Label(
-            label="Loading notifications...",
-            valign="center",
-            vexpand=True,
-            css_classes=["notification-center-info-label"],
-        )
+        self._store = Gio.ListStore(item_type=HistoryEntry)
+        self._exhausted = False
+        self._query = ""
+
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self.__on_setup)
+        factory.connect("bind", self.__on_bind)
+        factory.connect("unbind", self.__on_unbind)
 
         super().__init__(
-            vertical=True,
-            child=[loading_notifications_label],
+            model=Gtk.NoSelection(model=self._store),
+            factory=factory,
             vexpand=True,
-            css_classes=["rec-unset"],
-            setup=lambda self: notifications.connect(
-                "notified",
-                lambda x, notification: self.__on_notified(notification),
-            ),
+            css_classes=["rec-unset", "notification-list"],
         )
 
-        Utils.ThreadTask(
-            self.__load_notifications,
-            lambda result: self.set_child(result),
-        ).run()
-
-    def __on_notified(self, notification: Notification) -> None:
-        notify = Popup(notification)
-        self.prepend(notify)
-        notify.reveal_child = True
-
-    def __load_notifications(self) -> list[Widget.Label | Popup]:
-        widgets: list[Widget.Label | Popup] = []
-        for i in notifications.notifications:
-            GLib.idle_add(lambda i=i: widgets.append(Popup(i, reveal_child=True)))
-
-        widgets.append(
-            Widget.Label(
-                label="No notifications",
-                valign="center",
-                vexpand=True,
-                visible=notifications.bind(
-                    "notifications", lambda value: len(value) == 0
-                ),
-                css_classes=["notification-center-info-label"],
-            )
+        self.load_more()
+
+        self._handlers = [
+            history.connect("added", lambda x, entry: self.__on_added(entry)),
+            history.connect("removed", lambda x, entry: self.__on_removed(entry)),
+            history.connect("cleared", lambda x: self._store.remove_all()),
+        ]
+
+    @property
+    def store(self) -> Gio.ListStore:
+        return self._store
+
+    def set_query(self, query: str) -> None:
+        """Only show notifications matching ``query``, an empty query shows all."""
+        query = query.strip()
+        if query == self._query:
+            return
+        self._query = query
+        self._exhausted = False
+        self._store.remove_all()
+        self.load_more()
+
+    def load_more(self) -> None:
+        """Append the next page of older notifications."""
+        if self._exhausted:
+            return
+        n_items = self._store.get_n_items()
+        before = self._store.get_item(n_items - 1).rowid if n_items else None
+        if self._query:
+            page = history.search(self._query, before=before)
+        else:
+            page = history.load_page(before=before)
+        if not page:
+            self._exhausted = True
+            return
+        self._store.splice(n_items, 0, page)
+
+    def teardown(self) -> None:
+        """Stop following the history and drop the loaded entries."""
+        for handler in self._handlers:
+            history.disconnect(handler)
+        self._handlers = []
+        self._store.remove_all()
+
+    def clear_all(self) -> None:
+        """
+        Empty the history in one go, then close the live notifications.
+        """
+        history.clear()
+        notifications.clear_all()
+
+    def __on_setup(self, factory, list_item: Gtk.ListItem) -> None:
+        list_item.set_activatable(False)
+        list_item.set_child(
+            Widget.Box(css_classes=["notification-row"], child=[NotificationWidget()])
         )
-        return widgets
+
+    def __on_bind(self, factory, list_item: Gtk.ListItem) -> None:
+        list_item.get_child().child[0].bind(list_item.get_item())
+
+    def __on_unbind(self, factory, list_item: Gtk.ListItem) -> None:
+        list_item.get_child().child[0].unbind()
+
+    def __on_added(self, entry: HistoryEntry) -> None:
+        if self._query and not history.matches(entry, self._query):
+            return
+        self._store.insert(0, entry)
+
+    def __on_removed(self, entry: HistoryEntry) -> None:
+        found, position = self._store.find(entry)
+        if found:
+            self._store.remove(position)
 
 
 class NotificationCenter(Widget.Box):
     __gtype_name__ = "NotificationCenter"
 
     def __init__(self):
+        self._list = NotificationList()
+
+        self._count_label = Widget.Label(css_classes=["notification-count"])
+        self._dnd_label = Widget.Label()
+        self._info_label = Widget.Label(
+            label="No notifications",
+            valign="center",
+            vexpand=True,
+            css_classes=["notification-center-info-label"],
+        )
+        # The list view must be the direct child of the scroll so it
+        # only builds the rows in the viewport
+        self._scroll = Widget.Scroll(
+            child=self._list,
+            vexpand=True,
+            setup=lambda scroll: scroll.connect(
+                "edge-reached", self.__on_edge_reached
+            ),
+        )
+
         super().__init__(
             vertical=True,
             vexpand=True,
@@ -82,28 +144,66 @@ class NotificationCenter(Widget.Box):
                 Widget.Box(
                     css_classes=["notification-center-header", "rec-unset"],
                     child=[
-                        Widget.Label(
-                            label=notifications.bind(
-                                "notifications", lambda value: str(len(value))
-                            ),
-                            css_classes=["notification-count"],
-                        ),
+                        self._count_label,
                         Widget.Label(
                             label="notifications",
                             css_classes=["notification-header-label"],
                         ),
                         Widget.Button(
-                            child=Widget.Label(label="Clear all"),
+                            child=self._dnd_label,
                             halign="end",
                             hexpand=True,
-                            on_click=lambda x: notifications.clear_all(),
+                            tooltip_text="Do not disturb",
+                            on_click=lambda x: dnd.toggle(),
+                            css_classes=["notification-dnd"],
+                        ),
+                        Widget.Button(
+                            child=Widget.Label(label="Clear all"),
+                            halign="end",
+                            on_click=lambda x: self._list.clear_all(),
                             css_classes=["notification-clear-all"],
                         ),
                     ],
                 ),
-                Widget.Scroll(
-                    child=NotificationList(),
-                    vexpand=True,
+                Widget.Entry(
+                    placeholder_text="Search notifications",
+                    css_classes=["notification-search"],
+                    on_change=lambda entry: self._list.set_query(entry.text),
                 ),
+                self._info_label,
+                self._scroll,
             ],
-        )
\ No newline at end of file
+        )
+
+        # Plain handlers instead of bindings, so teardown can let go of them
+        self._count_handler = history.connect(
+            "notify::count", lambda *_: self.__on_count_changed()
+        )
+        self._dnd_handler = dnd.connect(
+            "notify::enabled", lambda *_: self.__on_dnd_changed()
+        )
+        self.__on_count_changed()
+        self.__on_dnd_changed()
+
+    def teardown(self) -> None:
+        """Disconnect from the shared services so the widgets can be freed."""
+        if self._count_handler is not None:
+            history.disconnect(self._count_handler)
+            self._count_handler = None
+        if self._dnd_handler is not None:
+            dnd.disconnect(self._dnd_handler)
+            self._dnd_handler = None
+        self._list.teardown()
+
+    def __on_count_changed(self) -> None:
+        count = history.count
+        self._count_label.label = str(count)
+        self._info_label.visible = count == 0
+        self._scroll.visible = count > 0
+
+    def __on_dnd_changed(self) -> None:
+        self._dnd_label.label = "󰂛" if dnd.enabled else "󰂚"
+
+    def __on_edge_reached(self, scroll, position: Gtk.PositionType) -> None:
+        if position == Gtk.PositionType.BOTTOM:
+            self._list.load_more()
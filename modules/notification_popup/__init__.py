@@ -1,4 +1,4 @@
-from .notification_popup import NotificationPopup
-
-__all__ = ["NotificationPopup"]
+from .notification_popup import NotificationPopup, PopupRouter
+from .dnd import DndController
 
+__all__ = ["NotificationPopup", "PopupRouter", "DndController"]
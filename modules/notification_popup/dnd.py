@@ -0,0 +1,131 @@
+import datetime
+
+from gi.repository import GObject  # type: ignore
+from ignis.gobject import IgnisGObject
+from ignis.utils import Utils
+from ignis.options import options
+from ignis.services.notifications import Notification, NotificationService
+
+notifications = NotificationService.get_default()
+
+# Daily do-not-disturb windows as ("HH:MM", "HH:MM"), may wrap past midnight
+DND_SCHEDULES: list[tuple[str, str]] = []
+
+
+def _parse_time(value: str) -> datetime.time:
+    hours, minutes = value.split(":")
+    return datetime.time(int(hours), int(minutes))
+
+
+class DndController(IgnisGObject):
+    """
+    Do-not-disturb on top of the ``options.notifications.dnd`` option.
+
+    While enabled the service stores notifications without emitting
+    ``new_popup``, so no popup widgets are built. Missed notifications are
+    only counted per application; ``ended`` hands that summary over once
+    do-not-disturb is turned off again.
+    """
+
+    _instance: "DndController | None" = None
+
+    def __init__(self, schedules: list[tuple[str, str]] | None = None):
+        super().__init__()
+        self._missed: dict[str, int] = {}
+        self._schedules: list[tuple[datetime.time, datetime.time]] = []
+        self._schedule_timeout = None
+
+        notifications.connect(
+            "notified", lambda x, notification: self.__on_notified(notification)
+        )
+        # Follow the option too when something else changes it
+        options.notifications.connect_option("dnd", self.__on_option_changed)
+        self.set_schedules(DND_SCHEDULES if schedules is None else schedules)
+
+    @classmethod
+    def get_default(cls) -> "DndController":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @GObject.Signal(arg_types=(object,))
+    def ended(self, missed): ...
+
+    @GObject.Property(type=bool, default=False)
+    def enabled(self) -> bool:
+        return options.notifications.dnd
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        # The option's change handler does the rest
+        if value != options.notifications.dnd:
+            options.notifications.dnd = value
+
+    @GObject.Property(type=int)
+    def missed_count(self) -> int:
+        return sum(self._missed.values())
+
+    def toggle(self) -> None:
+        """Flip do-not-disturb by hand, it holds until the next schedule edge."""
+        self.enabled = not self.enabled
+
+    def set_schedules(self, schedules: list[tuple[str, str]]) -> None:
+        """Replace the daily windows and apply the one in effect right now."""
+        try:
+            self._schedules = [
+                (_parse_time(start), _parse_time(end)) for start, end in schedules
+            ]
+        except ValueError as e:
+            print(f"Invalid do-not-disturb schedule: {e}")
+            self._schedules = []
+
+        if self._schedule_timeout is not None:
+            self._schedule_timeout.cancel()
+            self._schedule_timeout = None
+        if self._schedules:
+            self.__on_schedule_edge()
+
+    def in_schedule(self, now: datetime.datetime | None = None) -> bool:
+        moment = (now or datetime.datetime.now()).time()
+        for start, end in self._schedules:
+            if start <= end:
+                if start <= moment < end:
+                    return True
+            elif moment >= start or moment < end:
+                return True
+        return False
+
+    def __next_edge(self, now: datetime.datetime) -> datetime.datetime:
+        edges = []
+        for start, end in self._schedules:
+            for edge in (start, end):
+                candidate = datetime.datetime.combine(now.date(), edge)
+                if candidate <= now:
+                    candidate += datetime.timedelta(days=1)
+                edges.append(candidate)
+        return min(edges)
+
+    def __on_schedule_edge(self) -> None:
+        # Only wakes up on window boundaries instead of polling the clock
+        now = datetime.datetime.now()
+        self.enabled = self.in_schedule(now)
+        delay = (self.__next_edge(now) - now).total_seconds() * 1000
+        self._schedule_timeout = Utils.Timeout(
+            max(1000, int(delay)), self.__on_schedule_edge
+        )
+
+    def __on_option_changed(self) -> None:
+        self.notify("enabled")
+        if options.notifications.dnd:
+            return
+        missed, self._missed = self._missed, {}
+        self.notify("missed_count")
+        if missed:
+            self.emit("ended", missed)
+
+    def __on_notified(self, notification: Notification) -> None:
+        if not options.notifications.dnd:
+            return
+        app_name = notification.app_name or "Unknown"
+        self._missed[app_name] = self._missed.get(app_name, 0) + 1
+        self.notify("missed_count")
@@ -1,14 +1,130 @@
+import time
+from collections import deque
+
 from ignis.widgets import Widget
 from ignis.app import IgnisApp
 from ignis.utils import Utils
 from ignis.services.notifications import Notification, NotificationService
-from ..utils import NotificationWidget
+from gi.repository import Gtk  # type: ignore
+from ..utils import (
+    NotificationWidget,
+    NotificationWidgetPool,
+    get_focused_monitor,
+    get_monitor_index,
+)
+from .scheduler import ExpiryScheduler
+from .dnd import DndController
 
 
 app = IgnisApp.get_default()
 
 notifications = NotificationService.get_default()
 
+# This many notifications from one application within BURST_WINDOW ms are
+# grouped into a single stack popup
+BURST_THRESHOLD = 3
+BURST_WINDOW = 5000
+# Popups arriving faster than this are handled in one batch (ms)
+FLUSH_INTERVAL = 100
+# Popup lifetime when the application does not ask for one (ms)
+POPUP_TIMEOUT = 5000
+# The expiry scheduler owns popup lifetimes; config.py sets the service's
+# options.notifications.popup_timeout to this so its own timer stays out of
+# the way. Popups also ignore the service's dismissals, which still happen
+# on its wall-clock timer for notifications with an explicit timeout
+SERVICE_POPUP_TIMEOUT = 24 * 60 * 60 * 1000
+
+scheduler = ExpiryScheduler.get_default()
+widget_pool = NotificationWidgetPool.get_default()
+dnd = DndController.get_default()
+
+
+def schedule_expiry(notification: Notification, callback) -> int | None:
+    """Run ``callback`` once the notification's popup timeout has passed."""
+    timeout = notification.timeout
+    if timeout == 0:
+        # Asked to never expire
+        return None
+    if timeout is None or timeout < 0 or timeout >= SERVICE_POPUP_TIMEOUT:
+        timeout = POPUP_TIMEOUT
+    return scheduler.schedule_expiry(timeout, callback)
+
+
+def dismiss(notification: Notification) -> None:
+    """Take the notification out of the service's popups if it is still there."""
+    if notification in notifications.popups:
+        notification.dismiss()
+
+
+class PopupRouter:
+    """
+    Decides which monitor shows a notification popup.
+
+    Modes:
+        - ``"all"``: every monitor builds its own popup (the old behaviour)
+        - ``"focused"``: only the focused output, falling back to the primary one
+        - ``"primary"``: only ``primary_output``, falling back to the focused one
+    """
+
+    MODES = ("all", "focused", "primary")
+
+    def __init__(self, mode: str = "all", primary_output: str | None = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown popup routing mode: {mode}")
+        self.mode = mode
+        self.primary_output = primary_output
+        # Registrations per monitor index; windows may briefly share an index
+        # while outputs are renumbered
+        self._monitors: dict[int, int] = {}
+        self._last: tuple[object, int | None] | None = None
+
+    def register(self, monitor: int) -> None:
+        self._monitors[monitor] = self._monitors.get(monitor, 0) + 1
+        self._last = None
+
+    def unregister(self, monitor: int) -> None:
+        count = self._monitors.get(monitor, 0) - 1
+        if count > 0:
+            self._monitors[monitor] = count
+        else:
+            self._monitors.pop(monitor, None)
+        self._last = None
+
+    def accepts(self, monitor: int, notification: Notification) -> bool:
+        if self.mode == "all":
+            return True
+        return self._target(notification.id) == monitor
+
+    def accepts_summary(self, monitor: int, key: object) -> bool:
+        """
+        Like ``accepts``, for popups that are not backed by a notification.
+        A summary is shown on one monitor only, even in ``"all"`` mode.
+        """
+        return self._target(key) == monitor
+
+    def _target(self, key: object) -> int | None:
+        # Every PopupBox asks for the same notification in a row, resolve it once
+        if self._last is not None and self._last[0] == key:
+            return self._last[1]
+
+        primary = (
+            get_monitor_index(self.primary_output) if self.primary_output else None
+        )
+        if self.mode == "primary":
+            candidates = [primary, get_focused_monitor()]
+        else:
+            candidates = [get_focused_monitor(), primary]
+
+        target = next((m for m in candidates if m in self._monitors), None)
+        if target is None and self._monitors:
+            target = min(self._monitors)
+
+        self._last = (key, target)
+        return target
+
+
+_default_router = PopupRouter()
+
 
 class Popup(Widget.Box):
     def __init__(
@@ -16,64 +132,503 @@ class Popup(Widget.Box):
     ):
         self._box = box
         self._window = window
+        self.notification = notification
+
+        self._widget = widget_pool.acquire(
+            notification, css_classes=["notification-popup"]
+        )
+        self._setup_revealers(self._widget)
 
-        widget = NotificationWidget(notification)
-        widget.css_classes = ["notification-popup"]
+        self._closing = False
+        self._step = None
+        self._expiry = schedule_expiry(notification, self._expire)
+        # Only closing the notification ends the popup early
+        self._closed_handler = notification.connect(
+            "closed", lambda x: self.destroy()
+        )
+
+    def _expire(self) -> None:
+        self._expiry = None
+        dismiss(self.notification)
+        self.destroy()
+
+    def _setup_revealers(self, widget) -> None:
         self._inner = Widget.Revealer(transition_type="slide_left", child=widget)
         self._outer = Widget.Revealer(transition_type="slide_down", child=self._inner)
         super().__init__(child=[self._outer], halign="end")
 
-        notification.connect("dismissed", lambda x: self.destroy())
+    def reveal(self) -> None:
+        self._outer.reveal_child = True
+        self._step = scheduler.schedule_step(
+            self._outer.transition_duration, self._inner.set_reveal_child, True
+        )
+
+    def _release_widget(self) -> None:
+        if self._widget is not None:
+            # Clear the revealer's own child pointer, unparenting the widget
+            # directly would leave the revealer to unparent it again later
+            self._inner.set_child(None)
+            widget_pool.release(self._widget)
+            self._widget = None
+
+    def detach(self) -> None:
+        """Remove the popup right away, without animation, and stop tracking it."""
+        scheduler.cancel(self._expiry)
+        self._expiry = None
+        # A closing animation still queued would touch the popup afterwards
+        scheduler.cancel(self._step)
+        self._step = None
+        if self._closed_handler is not None:
+            self.notification.disconnect(self._closed_handler)
+            self._closed_handler = None
+        self._box.forget(self)
+        self._release_widget()
+        self.unparent()
 
     def destroy(self):
+        if self._closing:
+            return
+        self._closing = True
+        scheduler.cancel(self._expiry)
+        self._expiry = None
+
         def box_destroy():
+            self._box.forget(self)
+            self._release_widget()
             self.unparent()
-            if len(notifications.popups) == 0:
+            # Summary popups are not in the service's popup list
+            if self._box.get_first_child() is None:
                 self._window.visible = False
 
         def outer_close():
             self._outer.reveal_child = False
-            Utils.Timeout(self._outer.transition_duration, box_destroy)
+            self._step = scheduler.schedule_step(
+                self._outer.transition_duration, box_destroy
+            )
 
         self._inner.transition_type = "crossfade"
         self._inner.reveal_child = False
-        Utils.Timeout(self._outer.transition_duration, outer_close)
+        self._step = scheduler.schedule_step(
+            self._outer.transition_duration, outer_close
+        )
 
 
-class PopupBox(Widget.Box):
-    def __init__(self, window: "NotificationPopup", monitor: int):
+class StackPopup(Popup):
+    """
+    One popup for a burst of notifications from the same application.
+
+    Shows the count and the latest summary; the individual notification
+    widgets are only built while the stack is expanded.
+    """
+
+    def __init__(self, box: "PopupBox", window: "NotificationPopup", app_name: str):
+        self._box = box
         self._window = window
-        self._monitor = monitor
+        self.app_name = app_name
+        self.notification = None
+        self._widget = None
+        self._closed_handler = None
+        self._expiry = None
+        self._notifications: list[Notification] = []
+        self._handlers: dict[Notification, int] = {}
+        self._expiries: dict[Notification, int | None] = {}
+        self._widgets: dict[Notification, NotificationWidget] = {}
+        self._expanded = False
+        self._closing = False
+        self._step = None
 
-        super().__init__(
+        self._count_label = Widget.Label(css_classes=["notification-count"])
+        self._summary_label = Widget.Label(
+            ellipsize="end",
+            halign="start",
+            hexpand=True,
+            css_classes=["notification-summary"],
+        )
+        self._expand_icon = Widget.Icon(image="pan-down-symbolic", pixel_size=20)
+        self._items = Widget.Box(vertical=True, spacing=10, visible=False)
+
+        widget = Widget.Box(
+            vertical=True,
+            css_classes=["notification", "notification-popup", "notification-stack"],
+            child=[
+                Widget.Box(
+                    spacing=10,
+                    child=[
+                        self._count_label,
+                        Widget.Box(
+                            vertical=True,
+                            hexpand=True,
+                            child=[
+                                Widget.Label(
+                                    label=app_name,
+                                    halign="start",
+                                    ellipsize="end",
+                                    css_classes=["notification-stack-app"],
+                                ),
+                                self._summary_label,
+                            ],
+                        ),
+                        Widget.Button(
+                            child=self._expand_icon,
+                            valign="start",
+                            css_classes=["notification-close"],
+                            on_click=lambda x: self.toggle_expanded(),
+                        ),
+                        Widget.Button(
+                            child=Widget.Icon(
+                                image="window-close-symbolic", pixel_size=20
+                            ),
+                            valign="start",
+                            css_classes=["notification-close"],
+                            on_click=lambda x: self.dismiss_all(),
+                        ),
+                    ],
+                ),
+                self._items,
+            ],
+        )
+        self._setup_revealers(widget)
+
+    def add(self, notification: Notification) -> None:
+        self._notifications.append(notification)
+        self._handlers[notification] = notification.connect(
+            "closed", lambda x: self._remove(x)
+        )
+        self._expiries[notification] = schedule_expiry(
+            notification, lambda: self._expire(notification)
+        )
+        if self._expanded:
+            self._items.prepend(self._build_widget(notification))
+        self._update_header()
+
+    def toggle_expanded(self) -> None:
+        self._expanded = not self._expanded
+        self._expand_icon.image = (
+            "pan-up-symbolic" if self._expanded else "pan-down-symbolic"
+        )
+        if self._expanded:
+            self._items.child = [
+                self._build_widget(n) for n in reversed(self._notifications)
+            ]
+        else:
+            for widget in self._widgets.values():
+                widget_pool.release(widget)
+            self._widgets.clear()
+        self._items.visible = self._expanded
+
+    def _build_widget(self, notification: Notification) -> NotificationWidget:
+        widget = widget_pool.acquire(notification)
+        self._widgets[notification] = widget
+        return widget
+
+    def dismiss_all(self) -> None:
+        for notification in list(self._notifications):
+            dismiss(notification)
+            self._remove(notification)
+
+    def _expire(self, notification: Notification) -> None:
+        self._expiries.pop(notification, None)
+        dismiss(notification)
+        self._remove(notification)
+
+    def _remove(self, notification: Notification) -> None:
+        handler = self._handlers.pop(notification, None)
+        if handler is None:
+            return
+        notification.disconnect(handler)
+        scheduler.cancel(self._expiries.pop(notification, None))
+        self._notifications.remove(notification)
+
+        widget = self._widgets.pop(notification, None)
+        if widget is not None:
+            widget_pool.release(widget)
+
+        if not self._notifications:
+            self.destroy()
+            return
+        self._update_header()
+
+    def detach(self) -> None:
+        for notification in self._notifications:
+            notification.disconnect(self._handlers.pop(notification))
+            scheduler.cancel(self._expiries.pop(notification, None))
+        self._notifications.clear()
+        for widget in self._widgets.values():
+            widget_pool.release(widget)
+        self._widgets.clear()
+        super().detach()
+
+    def _update_header(self) -> None:
+        self._count_label.label = str(len(self._notifications))
+        if self._notifications:
+            self._summary_label.label = self._notifications[-1].summary
+
+
+class SummaryPopup(Popup):
+    """
+    A single popup listing what arrived while do-not-disturb was on, in
+    place of replaying every missed popup.
+    """
+
+    def __init__(
+        self, box: "PopupBox", window: "NotificationPopup", missed: dict[str, int]
+    ):
+        self._box = box
+        self._window = window
+        self.notification = None
+        self._widget = None
+        self._closed_handler = None
+        self._closing = False
+        self._step = None
+
+        total = sum(missed.values())
+        apps = sorted(missed.items(), key=lambda kv: kv[1], reverse=True)
+
+        widget = Widget.Box(
             vertical=True,
-            valign="start",
-            setup=lambda self: notifications.connect(
-                "new_popup",
-                lambda x, notification: self.__on_notified(notification),
-            ),
+            css_classes=["notification", "notification-popup", "notification-stack"],
+            child=[
+                Widget.Box(
+                    spacing=10,
+                    child=[
+                        Widget.Label(
+                            label=str(total), css_classes=["notification-count"]
+                        ),
+                        Widget.Label(
+                            label="missed while in do not disturb",
+                            halign="start",
+                            hexpand=True,
+                            ellipsize="end",
+                            css_classes=["notification-summary"],
+                        ),
+                        Widget.Button(
+                            child=Widget.Icon(
+                                image="window-close-symbolic", pixel_size=20
+                            ),
+                            valign="start",
+                            css_classes=["notification-close"],
+                            on_click=lambda x: self.destroy(),
+                        ),
+                    ],
+                ),
+                Widget.Label(
+                    label=", ".join(f"{app} ({count})" for app, count in apps),
+                    halign="start",
+                    ellipsize="end",
+                    css_classes=["notification-stack-app"],
+                ),
+                Widget.Button(
+                    child=Widget.Label(label="Open notifications"),
+                    css_classes=["notification-action"],
+                    style="margin-top: 0.75rem;",
+                    on_click=lambda x: self.__open_center(),
+                ),
+            ],
+        )
+        self._setup_revealers(widget)
+        self._expiry = scheduler.schedule_expiry(POPUP_TIMEOUT, self.destroy)
+
+    def __open_center(self) -> None:
+        app.open_window("ignis_CONTROL_CENTER")
+        self.destroy()
+
+
+class PopupBox(Widget.Box):
+    def __init__(self, window: "NotificationPopup", monitor: int, router: PopupRouter):
+        self._window = window
+        self._monitor: int | None = monitor
+        self._router = router
+        router.register(monitor)
+
+        # Incoming popups waiting for the next batch
+        self._queue: list[Notification] = []
+        self._flush_timeout = None
+        self._last_flush = 0.0
+        # Arrival times per application, to detect bursts
+        self._recent: dict[str, deque[float]] = {}
+        # Live individual popups and burst stacks per application
+        self._popups: dict[str, list[Popup]] = {}
+        self._stacks: dict[str, StackPopup] = {}
+
+        super().__init__(vertical=True, valign="start")
+        self._popup_handler = notifications.connect(
+            "new_popup", lambda x, notification: self.__on_notified(notification)
+        )
+        # The service emits no popups during do-not-disturb, one summary
+        # is shown when it ends
+        self._dnd_handler = dnd.connect(
+            "ended", lambda x, missed: self.__on_dnd_ended(missed)
         )
 
+        # Popups do not expire while the pointer is over them
+        self._hovered = False
+        motion_controller = Gtk.EventControllerMotion.new()
+        motion_controller.connect("enter", lambda *_: self.__set_hovered(True))
+        motion_controller.connect("leave", lambda *_: self.__set_hovered(False))
+        self.add_controller(motion_controller)
+
+    def set_monitor(self, monitor: int | None) -> None:
+        """Follow the output to a new index, or stop taking popups on None."""
+        if monitor == self._monitor:
+            return
+        if self._monitor is not None:
+            self._router.unregister(self._monitor)
+        self._monitor = monitor
+        if monitor is not None:
+            self._router.register(monitor)
+
+    def teardown(self) -> None:
+        """Disconnect from the services and drop every popup right away."""
+        notifications.disconnect(self._popup_handler)
+        dnd.disconnect(self._dnd_handler)
+        if self._flush_timeout is not None:
+            self._flush_timeout.cancel()
+            self._flush_timeout = None
+        self._queue.clear()
+        self.set_monitor(None)
+        # Expiries of the other outputs must not stay paused
+        self.__set_hovered(False)
+        for popup in list(self.child):
+            popup.detach()
+        self._popups.clear()
+        self._stacks.clear()
+
+    def __set_hovered(self, hovered: bool) -> None:
+        if hovered == self._hovered:
+            return
+        self._hovered = hovered
+        if hovered:
+            scheduler.pause()
+        else:
+            scheduler.resume()
+
+    def forget(self, popup: Popup) -> None:
+        if isinstance(popup, SummaryPopup):
+            return
+        if isinstance(popup, StackPopup):
+            if self._stacks.get(popup.app_name) is popup:
+                del self._stacks[popup.app_name]
+            return
+        app_popups = self._popups.get(popup.notification.app_name)
+        if app_popups and popup in app_popups:
+            app_popups.remove(popup)
+
     def __on_notified(self, notification: Notification) -> None:
+        if self._monitor is None or not self._router.accepts(
+            self._monitor, notification
+        ):
+            return
+        self._queue.append(notification)
+        if self._flush_timeout is not None:
+            return
+
+        # Handle a lone notification right away, batch the rest of a flood
+        elapsed = (time.monotonic() - self._last_flush) * 1000
+        if elapsed >= FLUSH_INTERVAL:
+            self.__flush()
+        else:
+            self._flush_timeout = Utils.Timeout(
+                int(FLUSH_INTERVAL - elapsed), self.__flush
+            )
+
+    def __flush(self) -> None:
+        self._flush_timeout = None
+        self._last_flush = time.monotonic()
+        queue, self._queue = self._queue, []
+
+        # Notifications closed while they waited for the batch get no popup
+        live = set(notifications.notifications)
+        by_app: dict[str, list[Notification]] = {}
+        for notification in queue:
+            if notification not in live:
+                continue
+            by_app.setdefault(notification.app_name, []).append(notification)
+
+        # Forget arrivals older than the burst window, for every application
+        # so ones that went quiet do not pile up
+        now = time.monotonic()
+        for app_name, recent in list(self._recent.items()):
+            while recent and (now - recent[0]) * 1000 > BURST_WINDOW:
+                recent.popleft()
+            if not recent:
+                del self._recent[app_name]
+
+        for app_name, group in by_app.items():
+            recent = self._recent.setdefault(app_name, deque())
+            recent.extend([now] * len(group))
+
+            stack = self._stacks.get(app_name)
+            if stack is None and len(recent) >= BURST_THRESHOLD:
+                stack = self.__start_stack(app_name)
+
+            if stack is not None:
+                for notification in group:
+                    stack.add(notification)
+            else:
+                for notification in group:
+                    self.__show_popup(notification)
+
+    def __on_dnd_ended(self, missed: dict[str, int]) -> None:
+        if self._monitor is None or not self._router.accepts_summary(
+            self._monitor, ("dnd", id(missed))
+        ):
+            return
+        self._window.visible = True
+        popup = SummaryPopup(box=self, window=self._window, missed=missed)
+        self.prepend(popup)
+        popup.reveal()
+
+    def __show_popup(self, notification: Notification) -> None:
         self._window.visible = True
         popup = Popup(box=self, window=self._window, notification=notification)
+        self._popups.setdefault(notification.app_name, []).append(popup)
         self.prepend(popup)
-        popup._outer.reveal_child = True
-        Utils.Timeout(
-            popup._outer.transition_duration, popup._inner.set_reveal_child, True
-        )
+        popup.reveal()
+
+    def __start_stack(self, app_name: str) -> StackPopup:
+        self._window.visible = True
+        stack = StackPopup(box=self, window=self._window, app_name=app_name)
+        self._stacks[app_name] = stack
+
+        # Fold the popups already shown for this application into the stack
+        for popup in list(self._popups.pop(app_name, [])):
+            popup.detach()
+            stack.add(popup.notification)
+
+        self.prepend(stack)
+        stack.reveal()
+        return stack
 
 
 class NotificationPopup(Widget.Window):
-    def __init__(self, monitor: int):
+    def __init__(
+        self,
+        monitor: int,
+        router: PopupRouter | None = None,
+        output: str | None = None,
+    ):
+        # Naming the window after the output keeps it unique when monitor
+        # indices shift on hotplug
         super().__init__(
             anchor=["right", "top", "bottom"],
             monitor=monitor,
-            namespace=f"ignis_NOTIFICATION_POPUP_{monitor}",
+            namespace=f"ignis_NOTIFICATION_POPUP_{output or monitor}",
             layer="top",
-            child=PopupBox(window=self, monitor=monitor),
+            child=PopupBox(window=self, monitor=monitor, router=router or _default_router),
             visible=False,
             # dynamic_input_region=True,
             css_classes=["rec-unset"],
             style="min-width: 29rem;",
         )
+
+    def set_monitor(self, monitor: int | None) -> None:
+        """Move to another monitor index, or detach from any output on None."""
+        self.child.set_monitor(monitor)
+        if monitor is None:
+            self.visible = False
+        else:
+            self.monitor = monitor
+
+    def teardown(self) -> None:
+        """Release the popups and service handlers, call before ``destroy``."""
+        self.child.teardown()
@@ -0,0 +1,133 @@
+import heapq
+import itertools
+import time
+from typing import Callable
+
+from ignis.utils import Utils
+
+# Timers due within this many ms of each other are fired in one batch
+BATCH_SLACK = 50
+
+
+class ExpiryScheduler:
+    """
+    A single timer for every notification popup.
+
+    Deadlines are kept in min-heaps and the timer is armed for the earliest
+    one only. Popup expiries run on a clock that stops while the scheduler is
+    paused (the pointer is over the popups); animation steps run on the real
+    clock so running transitions always finish. Everything due within
+    ``BATCH_SLACK`` ms is handled in one pass.
+    """
+
+    _instance: "ExpiryScheduler | None" = None
+
+    def __init__(self):
+        # (deadline, seq, callback); expiries use the pausable clock
+        self._expiries: list[tuple[float, int, Callable]] = []
+        self._steps: list[tuple[float, int, Callable]] = []
+        self._pending: set[int] = set()
+        self._cancelled: set[int] = set()
+        self._seq = itertools.count()
+
+        self._timer = None
+        self._timer_deadline: float | None = None
+
+        self._paused_at: float | None = None
+        self._pause_depth = 0
+        self._paused_total = 0.0
+
+    @classmethod
+    def get_default(cls) -> "ExpiryScheduler":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _expiry_clock(self) -> float:
+        now = self._paused_at if self._paused_at is not None else time.monotonic()
+        return now - self._paused_total
+
+    def schedule_expiry(self, delay: int, callback: Callable) -> int:
+        """Run ``callback`` after ``delay`` ms, not counting paused time."""
+        return self._push(self._expiries, self._expiry_clock() + delay / 1000, callback)
+
+    def schedule_step(self, delay: int, callback: Callable, *args) -> int:
+        """Run ``callback(*args)`` after ``delay`` ms of real time."""
+        return self._push(
+            self._steps, time.monotonic() + delay / 1000, lambda: callback(*args)
+        )
+
+    def cancel(self, handle: int | None) -> None:
+        if handle in self._pending:
+            self._pending.discard(handle)
+            self._cancelled.add(handle)
+
+    def pause(self) -> None:
+        self._pause_depth += 1
+        if self._pause_depth == 1:
+            self._paused_at = time.monotonic()
+            self._arm()
+
+    def resume(self) -> None:
+        if self._pause_depth == 0:
+            return
+        self._pause_depth -= 1
+        if self._pause_depth == 0:
+            self._paused_total += time.monotonic() - self._paused_at
+            self._paused_at = None
+            self._arm()
+
+    def _push(self, heap: list, deadline: float, callback: Callable) -> int:
+        handle = next(self._seq)
+        self._pending.add(handle)
+        heapq.heappush(heap, (deadline, handle, callback))
+        self._arm()
+        return handle
+
+    def _next_deadline(self) -> float | None:
+        """Earliest deadline on the real clock."""
+        deadlines = []
+        if self._steps:
+            deadlines.append(self._steps[0][0])
+        if self._expiries and self._paused_at is None:
+            deadlines.append(self._expiries[0][0] + self._paused_total)
+        return min(deadlines) if deadlines else None
+
+    def _arm(self) -> None:
+        deadline = self._next_deadline()
+        if deadline == self._timer_deadline:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._timer_deadline = deadline
+        if deadline is not None:
+            delay = max(0, int((deadline - time.monotonic()) * 1000))
+            self._timer = Utils.Timeout(delay, self._fire)
+
+    def _pop_due(self, heap: list, now: float) -> list[Callable]:
+        due = []
+        while heap and heap[0][0] <= now + BATCH_SLACK / 1000:
+            _, handle, callback = heapq.heappop(heap)
+            if handle in self._cancelled:
+                self._cancelled.discard(handle)
+                continue
+            self._pending.discard(handle)
+            due.append(callback)
+        return due
+
+    def _fire(self) -> None:
+        self._timer = None
+        self._timer_deadline = None
+
+        due = self._pop_due(self._steps, time.monotonic())
+        if self._paused_at is None:
+            due += self._pop_due(self._expiries, self._expiry_clock())
+
+        for callback in due:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in popup timer: {e}")
+
+        self._arm()
@@ -0,0 +1,3 @@
+from .osd import Osd, VolumeOsd
+
+__all__ = ["Osd", "VolumeOsd"]
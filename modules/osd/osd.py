@@ -0,0 +1,149 @@
+from ignis.widgets import Widget
+from ignis.utils import Utils
+from ignis.services.audio import AudioService
+
+# How long the OSD stays visible after the last change (ms)
+OSD_TIMEOUT = 1500
+# Changes right after startup are the audio service populating, not the user (ms)
+STARTUP_GRACE = 2000
+
+
+class Osd(Widget.Window):
+    """
+    An on-screen display for a level (volume, brightness, ...).
+
+    The window is built once per monitor and afterwards only updated, shown
+    and hidden. Repeated changes update it in place and restart the single
+    hide timer.
+    """
+
+    __gtype_name__ = "Osd"
+
+    def __init__(
+        self, monitor: int, timeout: int = OSD_TIMEOUT, output: str | None = None
+    ):
+        self._timeout = timeout
+        self._hide_timeout = None
+        self._attached = True
+
+        self._icon = Widget.Icon(pixel_size=24, css_classes=["osd-icon"])
+        self._level = Widget.Scale(
+            min=0,
+            max=100,
+            step=1,
+            sensitive=False,
+            hexpand=True,
+            css_classes=["osd-level"],
+        )
+        self._label = Widget.Label(css_classes=["osd-value"])
+
+        super().__init__(
+            namespace=f"ignis_OSD_{output or monitor}",
+            monitor=monitor,
+            layer="overlay",
+            anchor=["bottom"],
+            exclusivity="ignore",
+            visible=False,
+            css_classes=["rec-unset"],
+            child=Widget.Box(
+                spacing=10,
+                css_classes=["osd"],
+                child=[self._icon, self._level, self._label],
+            ),
+        )
+
+    def set_monitor(self, monitor: int | None) -> None:
+        """Move to another monitor index, or stay hidden on None."""
+        self._attached = monitor is not None
+        if monitor is None:
+            if self._hide_timeout is not None:
+                self._hide_timeout.cancel()
+            self._hide()
+        else:
+            self.monitor = monitor
+
+    def teardown(self) -> None:
+        """Stop the hide timer, call before ``destroy``."""
+        if self._hide_timeout is not None:
+            self._hide_timeout.cancel()
+            self._hide_timeout = None
+        self._attached = False
+
+    def show_level(self, icon_name: str, value: int) -> None:
+        """Update the OSD in place and (re)start its hide timer."""
+        if not self._attached:
+            return
+        value = max(0, min(100, round(value)))
+        self._icon.image = icon_name
+        self._level.value = value
+        self._label.label = str(value)
+        self.visible = True
+
+        if self._hide_timeout is not None:
+            self._hide_timeout.cancel()
+        self._hide_timeout = Utils.Timeout(self._timeout, self._hide)
+
+    def _hide(self):
+        self._hide_timeout = None
+        self.visible = False
+
+
+class VolumeOsd(Osd):
+    """
+    Shows the speaker volume whenever it changes, from media keys or any
+    other client.
+    """
+
+    __gtype_name__ = "VolumeOsd"
+
+    def __init__(
+        self, monitor: int, timeout: int = OSD_TIMEOUT, output: str | None = None
+    ):
+        super().__init__(monitor, timeout, output)
+        self.audio = AudioService.get_default()
+        self._stream = None
+        self._handlers: list[int] = []
+        self._last_state = None
+        self._ready = False
+
+        self._bind_speaker()
+        self._speaker_handler = self.audio.connect(
+            "notify::speaker", lambda *_: self._bind_speaker()
+        )
+        self._ready_timeout = Utils.Timeout(STARTUP_GRACE, self._on_ready)
+
+    def _on_ready(self):
+        self._ready_timeout = None
+        self._ready = True
+
+    def teardown(self) -> None:
+        super().teardown()
+        if self._ready_timeout is not None:
+            self._ready_timeout.cancel()
+            self._ready_timeout = None
+        self.audio.disconnect(self._speaker_handler)
+        for handler in self._handlers:
+            self._stream.disconnect(handler)
+        self._handlers = []
+
+    def _bind_speaker(self):
+        for handler in self._handlers:
+            self._stream.disconnect(handler)
+        self._stream = self.audio.speaker
+        self._last_state = self._state()
+        self._handlers = [
+            self._stream.connect("notify::volume", lambda *_: self._on_changed()),
+            self._stream.connect("notify::is-muted", lambda *_: self._on_changed()),
+        ]
+
+    def _state(self) -> tuple:
+        return (self._stream.volume, self._stream.is_muted)
+
+    def _on_changed(self):
+        state = self._state()
+        if state == self._last_state:
+            return
+        self._last_state = state
+        if not self._ready or self._stream.volume is None:
+            return
+        self.show_level(self._stream.icon_name, self._stream.volume)
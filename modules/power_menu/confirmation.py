@@ -0,0 +1,96 @@
+from typing import Callable
+
+from ignis.widgets import Widget
+from ..utils import get_focused_monitor
+
+
+class ConfirmationOverlay(Widget.Window):
+    """
+    One prebuilt confirmation dialog shared by every PowerMenu.
+
+    ``ask`` retargets its labels and callback and shows it on the focused
+    monitor, so no new layer surface is created per action.
+    """
+
+    _instance: "ConfirmationOverlay | None" = None
+
+    def __init__(self):
+        self._on_confirm: Callable[[], None] | None = None
+
+        self._title = Widget.Label(css_classes=["confirmation-title"])
+        self._message = Widget.Label(css_classes=["confirmation-message"])
+        self._confirm_button = Widget.Button(
+            css_classes=["confirm-button", "destructive-action"],
+            on_click=lambda _: self._confirm(),
+        )
+
+        super().__init__(
+            namespace="ignis_POWER_CONFIRMATION",
+            layer="overlay",
+            popup=True,
+            kb_mode="exclusive",
+            visible=False,
+            css_classes=["confirmation-window"],
+            exclusivity="ignore",
+            child=Widget.CenterBox(
+                center_widget=Widget.Box(
+                    orientation="vertical",
+                    spacing=20,
+                    css_classes=["confirmation-dialog"],
+                    child=[
+                        self._title,
+                        self._message,
+                        Widget.Box(
+                            orientation="horizontal",
+                            spacing=10,
+                            homogeneous=True,
+                            css_classes=["confirmation-buttons"],
+                            child=[
+                                Widget.Button(
+                                    label="Cancel",
+                                    css_classes=["cancel-button"],
+                                    on_click=lambda _: self.cancel(),
+                                ),
+                                self._confirm_button,
+                            ],
+                        ),
+                    ],
+                )
+            ),
+        )
+
+    @classmethod
+    def get_default(cls) -> "ConfirmationOverlay":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def ask(
+        self, action_name: str, message: str, on_confirm: Callable[[], None]
+    ) -> None:
+        """Show the dialog for an action, replacing any pending question."""
+        self._on_confirm = on_confirm
+        self._title.label = f"Confirm {action_name}"
+        self._message.label = message
+        self._confirm_button.label = action_name
+
+        monitor = get_focused_monitor()
+        if monitor is not None and monitor != self.monitor:
+            # A layer surface only moves between outputs while unmapped
+            self.visible = False
+            self.monitor = monitor
+        self.visible = True
+
+    def cancel(self) -> None:
+        self._on_confirm = None
+        self.visible = False
+
+    def _confirm(self) -> None:
+        on_confirm, self._on_confirm = self._on_confirm, None
+        self.visible = False
+        if on_confirm is None:
+            return
+        try:
+            on_confirm()
+        except Exception as e:
+            print(f"Error executing power command: {e}")
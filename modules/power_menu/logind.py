@@ -0,0 +1,148 @@
+import os
+from typing import Any, Callable
+
+from gi.repository import Gio, GLib  # type: ignore
+
+LOGIN1_NAME = "org.freedesktop.login1"
+LOGIN1_PATH = "/org/freedesktop/login1"
+LOGIN1_MANAGER = "org.freedesktop.login1.Manager"
+# Set to "session" to talk to a stand-in login1 service on the session bus
+LOGIN1_BUS_ENV = "IGNIS_LOGIN1_BUS"
+
+
+def _default_bus_type() -> Gio.BusType:
+    if os.environ.get(LOGIN1_BUS_ENV) == "session":
+        return Gio.BusType.SESSION
+    return Gio.BusType.SYSTEM
+
+
+class Logind:
+    """
+    Asynchronous client for the ``org.freedesktop.login1.Manager`` interface.
+
+    The proxy is created on first use without blocking the main loop; calls
+    made before it is ready are queued.
+    """
+
+    _instance: "Logind | None" = None
+
+    def __init__(self, bus_type: Gio.BusType | None = None):
+        self._bus_type = _default_bus_type() if bus_type is None else bus_type
+        self._proxy: Gio.DBusProxy | None = None
+        self._waiting: list[Callable[[Gio.DBusProxy | None], None]] = []
+        # Can<action> answers, and callbacks waiting for one still in flight
+        self._can: dict[str, bool] = {}
+        self._can_waiting: dict[str, list[Callable[[bool], None]]] = {}
+
+    @classmethod
+    def get_default(cls) -> "Logind":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def can(self, action: str, callback: Callable[[bool], None]) -> None:
+        """
+        Ask ``Can<action>`` (e.g. ``"Suspend"``); ``callback`` gets True for
+        ``yes`` and ``challenge``, False otherwise or on error. Each action is
+        only asked once, later callers get the cached answer.
+        """
+        if action in self._can:
+            callback(self._can[action])
+            return
+        waiting = self._can_waiting.setdefault(action, [])
+        waiting.append(callback)
+        if len(waiting) > 1:
+            return
+
+        def answer(available: bool) -> None:
+            self._can[action] = available
+            for waiter in self._can_waiting.pop(action, []):
+                waiter(available)
+
+        self.call(
+            f"Can{action}",
+            None,
+            on_done=lambda value: answer(value[0] in ("yes", "challenge")),
+            on_error=lambda: answer(False),
+        )
+
+    def suspend(self) -> None:
+        self.call("Suspend", GLib.Variant("(b)", (True,)))
+
+    def hibernate(self) -> None:
+        self.call("Hibernate", GLib.Variant("(b)", (True,)))
+
+    def reboot(self) -> None:
+        self.call("Reboot", GLib.Variant("(b)", (True,)))
+
+    def power_off(self) -> None:
+        self.call("PowerOff", GLib.Variant("(b)", (True,)))
+
+    def terminate_session(self, session_id: str | None = None) -> None:
+        # "auto" makes logind resolve the caller's own session
+        session_id = session_id or os.environ.get("XDG_SESSION_ID", "auto")
+        self.call("TerminateSession", GLib.Variant("(s)", (session_id,)))
+
+    def call(
+        self,
+        method: str,
+        parameters: GLib.Variant | None,
+        on_done: Callable[[Any], None] | None = None,
+        on_error: Callable[[], None] | None = None,
+    ) -> None:
+        def invoke(proxy: Gio.DBusProxy | None) -> None:
+            if proxy is None:
+                if on_error:
+                    on_error()
+                return
+            proxy.call(
+                method,
+                parameters,
+                Gio.DBusCallFlags.ALLOW_INTERACTIVE_AUTHORIZATION,
+                -1,
+                None,
+                self.__on_call_done,
+                (method, on_done, on_error),
+            )
+
+        self.__with_proxy(invoke)
+
+    def __with_proxy(self, callback: Callable[[Gio.DBusProxy | None], None]) -> None:
+        if self._proxy is not None:
+            callback(self._proxy)
+            return
+        self._waiting.append(callback)
+        if len(self._waiting) > 1:
+            return
+        Gio.DBusProxy.new_for_bus(
+            self._bus_type,
+            Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES
+            | Gio.DBusProxyFlags.DO_NOT_CONNECT_SIGNALS,
+            None,
+            LOGIN1_NAME,
+            LOGIN1_PATH,
+            LOGIN1_MANAGER,
+            None,
+            self.__on_proxy_ready,
+        )
+
+    def __on_proxy_ready(self, source, result: Gio.AsyncResult) -> None:
+        try:
+            self._proxy = Gio.DBusProxy.new_for_bus_finish(result)
+        except GLib.Error as e:
+            print(f"Error connecting to logind: {e.message}")
+        waiting, self._waiting = self._waiting, []
+        for callback in waiting:
+            callback(self._proxy)
+
+    def __on_call_done(self, proxy: Gio.DBusProxy, result: Gio.AsyncResult, data):
+        method, on_done, on_error = data
+        try:
+            value = proxy.call_finish(result)
+        except GLib.Error as e:
+            print(f"Error calling logind {method}: {e.message}")
+            if on_error:
+                on_error()
+            return
+        if on_done:
+            on_done(value.unpack())
@@ -1,47 +1,27 @@
 import asyncio
-import time
 from ignis.widgets import Widget
 from ignis.utils import Utils
 from ignis.services.hyprland import HyprlandService
 from functools import partial
+from .confirmation import ConfirmationOverlay
+from .logind import Logind
+
+# Command used to lock the screen
+LOCK_COMMAND = "hyprlock"
+# Delay between confirming an action and running it, to let the UI settle (ms)
+ACTION_DELAY = 500
 
 
 class PowerMenu(Widget.Button):
     def __init__(self):
         self.hyprland = HyprlandService.get_default()
+        self.logind = Logind.get_default()
 
-        self.menu = Widget.PopoverMenu(
-            items=[
-                Widget.MenuItem(
-                    label="Lock",
-                    on_activate=partial(self._exec_command, "hyprlock"),
-                ),
-                Widget.Separator(),
-                Widget.MenuItem(
-                    label="Suspend",
-                    on_activate=partial(self._exec_with_confirmation, "systemctl suspend", "Suspend", "Are you sure you want to suspend the system?"),
-                ),
-                Widget.MenuItem(
-                    label="Hibernate",
-                    on_activate=partial(self._exec_with_confirmation, "systemctl hibernate", "Hibernate", "Are you sure you want to hibernate the system?"),
-                ),
-                Widget.Separator(),
-                Widget.MenuItem(
-                    label="Reboot",
-                    on_activate=partial(self._exec_with_confirmation, "systemctl reboot", "Reboot", "Are you sure you want to reboot the system?"),
-                ),
-                Widget.MenuItem(
-                    label="Shutdown",
-                    on_activate=partial(self._exec_with_confirmation, "systemctl poweroff", "Shutdown", "Are you sure you want to shutdown the system?"),
-                ),
-                Widget.Separator(),
-                Widget.MenuItem(
-                    label="Logout",
-                    enabled=self.hyprland.is_available,
-                    on_activate=partial(self._exec_with_confirmation, "loginctl kill-session $XDG_SESSION_ID", "Logout", "Are you sure you want to logout?"),
-                ),
-            ]
-        )
+        # Logind action -> its menu entry, disabled until logind says the
+        # action is possible
+        self._items: dict[str, Widget.MenuItem] = {}
+
+        self.menu = Widget.PopoverMenu(items=self._build_items())
 
         super().__init__(
             child=Widget.Box(
@@ -55,76 +35,68 @@ class PowerMenu(Widget.Button):
 
         self.add_css_class("power-menu")
 
+        for action in self._items:
+            self.logind.can(action, partial(self._on_capability, action))
+
+    def _build_items(self):
+        self._items = {
+            "Suspend": Widget.MenuItem(
+                label="Suspend",
+                enabled=False,
+                on_activate=partial(self._exec_with_confirmation, self.logind.suspend, "Suspend", "Are you sure you want to suspend the system?"),
+            ),
+            "Hibernate": Widget.MenuItem(
+                label="Hibernate",
+                enabled=False,
+                on_activate=partial(self._exec_with_confirmation, self.logind.hibernate, "Hibernate", "Are you sure you want to hibernate the system?"),
+            ),
+            "Reboot": Widget.MenuItem(
+                label="Reboot",
+                enabled=False,
+                on_activate=partial(self._exec_with_confirmation, self.logind.reboot, "Reboot", "Are you sure you want to reboot the system?"),
+            ),
+            "PowerOff": Widget.MenuItem(
+                label="Shutdown",
+                enabled=False,
+                on_activate=partial(self._exec_with_confirmation, self.logind.power_off, "Shutdown", "Are you sure you want to shutdown the system?"),
+            ),
+        }
+        return [
+            Widget.MenuItem(
+                label="Lock",
+                on_activate=self._lock,
+            ),
+            Widget.Separator(),
+            self._items["Suspend"],
+            self._items["Hibernate"],
+            Widget.Separator(),
+            self._items["Reboot"],
+            self._items["PowerOff"],
+            Widget.Separator(),
+            Widget.MenuItem(
+                label="Logout",
+                enabled=self.hyprland.is_available,
+                on_activate=partial(self._exec_with_confirmation, self.logind.terminate_session, "Logout", "Are you sure you want to logout?"),
+            ),
+        ]
+
+    def _on_capability(self, action, available):
+        # Flip the existing entry, rebuilding would recreate the whole menu
+        self._items[action].enabled = available
+
     def _on_menu_click(self, _):
         self.menu.popup()
 
-    def _exec_command(self, command, _):
-        Utils.exec_sh(command)
-    
-    def _exec_with_confirmation(self, command, action_name, message, _):
-        """Execute command after showing confirmation dialog"""
-        # Create a confirmation window with unique namespace
-        timestamp = int(time.time() * 1000)  # milliseconds for uniqueness
-        confirmation_window = Widget.Window(
-            namespace=f"power-confirmation-{action_name.lower()}-{timestamp}",
-            layer="overlay",
-            popup=True,
-            kb_mode="exclusive",
-            css_classes=["confirmation-window"],
-            # anchor=["top", "bottom", "left", "right"],
-            exclusivity="ignore",
-            child=Widget.CenterBox(
-                center_widget=Widget.Box(
-                    orientation="vertical",
-                    spacing=20,
-                    css_classes=["confirmation-dialog"],
-                    child=[
-                        Widget.Label(
-                            label=f"Confirm {action_name}",
-                            css_classes=["confirmation-title"]
-                        ),
-                        Widget.Label(
-                            label=message,
-                            css_classes=["confirmation-message"]
-                        ),
-                        Widget.Box(
-                            orientation="horizontal",
-                            spacing=10,
-                            homogeneous=True,
-                            css_classes=["confirmation-buttons"],
-                            child=[
-                                Widget.Button(
-                                    label="Cancel",
-                                    css_classes=["cancel-button"],
-                                    on_click=lambda _: self._close_confirmation(confirmation_window),
-                                ),
-                                Widget.Button(
-                                    label=action_name,
-                                    css_classes=["confirm-button", "destructive-action"],
-                                    on_click=lambda _: self._confirm_and_execute(confirmation_window, command),
-                                ),
-                            ]
-                        )
-                    ]
-                )
-            )
+    def _lock(self, _):
+        # The locker runs until unlock, never wait for it on the main loop
+        asyncio.create_task(Utils.exec_sh_async(LOCK_COMMAND))
+
+    def _exec_with_confirmation(self, action, action_name, message, _):
+        """Run a logind action after showing confirmation dialog"""
+        ConfirmationOverlay.get_default().ask(
+            action_name, message, partial(self._confirm_and_execute, action)
         )
-        confirmation_window.show()
-    
-    def _close_confirmation(self, window):
-        """Close the confirmation window"""
-        window.close()
-    
-    def _confirm_and_execute(self, window, command):
-        """Close confirmation window and execute the command"""
-        window.close()
-        try:
-            # Add a small delay to let UI settle before executing power commands
-            asyncio.create_task(self._delayed_execute(command))
-        except Exception as e:
-            print(f"Error executing power command: {e}")
-    
-    async def _delayed_execute(self, command):
-        """Execute command with a small delay to let UI settle"""
-        await asyncio.sleep(0.5)
-        await Utils.exec_sh_async(command)
+
+    def _confirm_and_execute(self, action):
+        """Run the confirmed action once the dialog is gone"""
+        Utils.Timeout(ACTION_DELAY, action)
@@ -0,0 +1,89 @@
+import importlib
+import os
+import sys
+import time
+from typing import Any, Callable
+
+# Set to 1 to print an import-time breakdown once the config is loaded
+IMPORT_REPORT_ENV = "IGNIS_REK_IMPORT_REPORT"
+# Import budget for all registered modules together (ms), overridable
+# through IGNIS_REK_IMPORT_BUDGET
+IMPORT_BUDGET_MS = 250.0
+
+# Modules imported through the registry and how long each took (ms)
+_import_times: dict[str, float] = {}
+# Loads that were not started from inside another registry load; only these
+# add up to the total, nested ones are already part of their parent's time
+_top_level: set[str] = set()
+_depth = 0
+
+
+def load(module_path: str) -> Any:
+    """Import a module on first use and record how long it took."""
+    module = sys.modules.get(module_path)
+    if module is not None:
+        return module
+    global _depth
+    nested = _depth > 0
+    _depth += 1
+    started = time.perf_counter()
+    try:
+        module = importlib.import_module(module_path)
+    finally:
+        _depth -= 1
+    _import_times[module_path] = (time.perf_counter() - started) * 1000
+    if not nested:
+        _top_level.add(module_path)
+    return module
+
+
+def lazy_exports(package: str, exports: dict[str, str]) -> Callable[[str], Any]:
+    """
+    Build a module ``__getattr__`` that imports ``exports[name]`` (a module
+    path relative to ``package``) only when ``name`` is first accessed.
+    """
+    package_module = sys.modules[package]
+
+    def __getattr__(name: str) -> Any:
+        module_path = exports.get(name)
+        if module_path is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(load(f"{package}{module_path}"), name)
+        # Cache on the package so later lookups skip __getattr__
+        setattr(package_module, name, value)
+        return value
+
+    return __getattr__
+
+
+def import_times() -> dict[str, float]:
+    """Import times per module, slowest first. Times include submodules."""
+    return dict(sorted(_import_times.items(), key=lambda kv: kv[1], reverse=True))
+
+
+def import_budget() -> float:
+    try:
+        return float(os.environ.get("IGNIS_REK_IMPORT_BUDGET", IMPORT_BUDGET_MS))
+    except ValueError:
+        return IMPORT_BUDGET_MS
+
+
+def print_import_report(force: bool = False) -> bool:
+    """
+    Print the breakdown when the report mode is on. Returns False if the
+    registered imports went over budget.
+    """
+    times = import_times()
+    total = sum(ms for path, ms in times.items() if path in _top_level)
+    within = total <= import_budget()
+
+    if not (force or os.environ.get(IMPORT_REPORT_ENV) == "1"):
+        return within
+
+    print("Module import times:")
+    for path, ms in times.items():
+        nested = "" if path in _top_level else "  (nested)"
+        print(f"  {ms:8.1f} ms  {path}{nested}")
+    status = "within" if within else "OVER"
+    print(f"  {total:8.1f} ms  total, {status} budget of {import_budget():.0f} ms")
+    return within
@@ -22,7 +22,8 @@ class WindowTitle(Widget.Label):
             max_width_chars=80
         )
         
-        # Set up window manager specific bindings
+        # Set up window manager specific handlers
+        self._handlers = []
         self._setup_bindings()
         
         # Add CSS class
@@ -38,22 +39,35 @@ class WindowTitle(Widget.Label):
             self.label = ""
     
     def _setup_hyprland_bindings(self):
-        """Set up Hyprland-specific bindings."""
-        self.label = self.hyprland.bind(
-            "active_window",
-            transform=lambda value: value.title
+        """Set up Hyprland-specific handlers."""
+        def update(*_):
+            self.label = self.hyprland.active_window.title
+
+        self._handlers.append(
+            (self.hyprland, self.hyprland.connect("notify::active-window", update))
         )
+        update()
     
     def _setup_niri_bindings(self):
-        """Set up Niri-specific bindings."""
-        # Bind visibility to active output
-        self.visible = self.niri.bind(
-            "active_output",
-            lambda x: x["name"] == self._monitor_name
-        )
-        
-        # Bind label to active window title
-        self.label = self.niri.bind(
-            "active_window",
-            transform=lambda value: "" if value is None else value["title"]
-        )
+        """Set up Niri-specific handlers."""
+        # Only shown on the active output
+        def update_visible(*_):
+            self.visible = self.niri.active_output["name"] == self._monitor_name
+
+        # Label follows the active window title
+        def update_label(*_):
+            window = self.niri.active_window
+            self.label = "" if window is None else window["title"]
+
+        self._handlers += [
+            (self.niri, self.niri.connect("notify::active-output", update_visible)),
+            (self.niri, self.niri.connect("notify::active-window", update_label)),
+        ]
+        update_visible()
+        update_label()
+
+    def teardown(self):
+        """Disconnect from the window manager service."""
+        for obj, handler in self._handlers:
+            obj.disconnect(handler)
+        self._handlers = []
@@ -1,3 +1,4 @@
 from .tray import Tray
+from .model import TrayModel
 
-__all__ = ["Tray"] 
\ No newline at end of file
+__all__ = ["Tray", "TrayModel"]
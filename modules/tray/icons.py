@@ -0,0 +1,86 @@
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+from gi.repository import Gdk, GdkPixbuf, Gtk  # type: ignore
+
+# Size tray icons are rendered at in the bar
+ICON_SIZE = 24
+# Maximum number of decoded icons kept in memory
+CACHE_SIZE = 128
+
+
+class IconCache:
+    """
+    Decodes tray icons once, scaled to the bar's icon size, and shares the
+    resulting paintables between every monitor's tray.
+
+    Themed icons are cached by name, raw ``IconPixmap`` data by a hash of the
+    pixel buffer.
+    """
+
+    def __init__(self, size: int = ICON_SIZE, max_entries: int = CACHE_SIZE):
+        self._size = size
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple, Gdk.Paintable] = OrderedDict()
+
+    def lookup(self, icon) -> Optional[Gdk.Paintable]:
+        """Return a shared paintable for an icon name, file path or pixbuf."""
+        if not icon:
+            return None
+
+        key = self._key(icon)
+        paintable = self._entries.get(key)
+        if paintable is not None:
+            self._entries.move_to_end(key)
+            return paintable
+
+        try:
+            paintable = self._decode(icon)
+        except Exception as e:
+            print(f"Error decoding tray icon: {e}")
+            return None
+
+        if paintable is not None:
+            self._entries[key] = paintable
+            if len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return paintable
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _key(self, icon) -> tuple:
+        if isinstance(icon, GdkPixbuf.Pixbuf):
+            digest = hashlib.blake2b(
+                icon.read_pixel_bytes().get_data(), digest_size=16
+            ).hexdigest()
+            return ("pixmap", icon.get_width(), icon.get_height(), digest)
+        return ("name", str(icon))
+
+    def _decode(self, icon) -> Optional[Gdk.Paintable]:
+        if isinstance(icon, GdkPixbuf.Pixbuf):
+            return Gdk.Texture.new_for_pixbuf(self._scale(icon))
+
+        icon = str(icon)
+        if icon.startswith("/"):
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(
+                icon, self._size, self._size, True
+            )
+            return Gdk.Texture.new_for_pixbuf(pixbuf)
+
+        theme = Gtk.IconTheme.get_for_display(Gdk.Display.get_default())
+        return theme.lookup_icon(
+            icon, None, self._size, 1, Gtk.TextDirection.NONE, 0
+        )
+
+    def _scale(self, pixbuf: GdkPixbuf.Pixbuf) -> GdkPixbuf.Pixbuf:
+        width, height = pixbuf.get_width(), pixbuf.get_height()
+        if width == self._size and height == self._size:
+            return pixbuf
+        factor = self._size / max(width, height)
+        return pixbuf.scale_simple(
+            max(1, round(width * factor)),
+            max(1, round(height * factor)),
+            GdkPixbuf.InterpType.BILINEAR,
+        )
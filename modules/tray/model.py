@@ -0,0 +1,195 @@
+import os
+import time
+
+from gi.repository import GObject  # type: ignore
+from ignis.gobject import IgnisGObject
+from ignis.utils import Utils
+from ignis.services.system_tray import SystemTrayItem, SystemTrayService
+
+from .icons import IconCache
+
+system_tray = SystemTrayService.get_default()
+
+# Minimum time between two applied icon/tooltip updates of one item (ms)
+UPDATE_INTERVAL = 500
+# IGNIS_REK_TRAY_REPORT=1 prints the update counters per application every
+# STATS_REPORT_INTERVAL ms, to spot the noisy ones
+STATS_REPORT_ENV = "IGNIS_REK_TRAY_REPORT"
+STATS_REPORT_INTERVAL = 60_000
+
+
+def _new_stats() -> dict[str, int]:
+    return {
+        "icon_received": 0,
+        "icon_applied": 0,
+        "icon_skipped": 0,
+        "tooltip_received": 0,
+        "tooltip_applied": 0,
+        "tooltip_skipped": 0,
+    }
+
+
+class TrayEntry(IgnisGObject):
+    """
+    Process-wide state of a single tray item, shared by the trays of all bars.
+
+    ``NewIcon``/``NewToolTip`` emissions are coalesced: at most one icon and
+    one tooltip update is applied per ``update_interval`` ms, the latest
+    payload always wins and identical payloads are skipped.
+    """
+
+    def __init__(
+        self,
+        item: SystemTrayItem,
+        icons: IconCache,
+        stats: dict[str, int],
+        update_interval: int = UPDATE_INTERVAL,
+    ):
+        super().__init__()
+        self.item = item
+        self._icons = icons
+        self._stats = stats
+        self._update_interval = update_interval
+        self._icon = icons.lookup(item.icon)
+        self._tooltip = item.tooltip or ""
+
+        self._dirty: set[str] = set()
+        self._flush_timeout = None
+        self._last_flush = 0.0
+
+        item.connect("notify::icon", lambda *_: self._queue_update("icon"))
+        item.connect("notify::tooltip", lambda *_: self._queue_update("tooltip"))
+        item.connect("removed", lambda x: self._on_removed())
+
+    @GObject.Signal
+    def removed(self): ...
+
+    @GObject.Property(type=object)
+    def icon(self):
+        """The decoded, pre-scaled icon as a ``Gdk.Paintable``."""
+        return self._icon
+
+    @GObject.Property(type=str)
+    def tooltip(self) -> str:
+        return self._tooltip
+
+    def _queue_update(self, prop: str):
+        self._stats[f"{prop}_received"] += 1
+        self._dirty.add(prop)
+        if self._flush_timeout is not None:
+            return
+
+        elapsed = (time.monotonic() - self._last_flush) * 1000
+        if elapsed >= self._update_interval:
+            self._flush()
+        else:
+            self._flush_timeout = Utils.Timeout(
+                int(self._update_interval - elapsed), self._flush
+            )
+
+    def _flush(self):
+        self._flush_timeout = None
+        self._last_flush = time.monotonic()
+        dirty, self._dirty = self._dirty, set()
+
+        if "icon" in dirty:
+            icon = self._icons.lookup(self.item.icon)
+            if icon is self._icon:
+                self._stats["icon_skipped"] += 1
+            else:
+                self._icon = icon
+                self._stats["icon_applied"] += 1
+                self.notify("icon")
+
+        if "tooltip" in dirty:
+            tooltip = self.item.tooltip or ""
+            if tooltip == self._tooltip:
+                self._stats["tooltip_skipped"] += 1
+            else:
+                self._tooltip = tooltip
+                self._stats["tooltip_applied"] += 1
+                self.notify("tooltip")
+
+    def _on_removed(self):
+        if self._flush_timeout is not None:
+            self._flush_timeout.cancel()
+            self._flush_timeout = None
+        self.emit("removed")
+
+
+class TrayModel(IgnisGObject):
+    """
+    A single tray model per process. Listens to ``SystemTrayService`` once and
+    hands out shared ``TrayEntry`` objects to every ``Tray`` view.
+    """
+
+    _instance: "TrayModel | None" = None
+
+    def __init__(self, update_interval: int = UPDATE_INTERVAL):
+        super().__init__()
+        self._icons = IconCache()
+        self._entries: dict[SystemTrayItem, TrayEntry] = {}
+        self._update_interval = update_interval
+        # Update counters per application, kept after the item goes away
+        self._stats: dict[str, dict[str, int]] = {}
+
+        system_tray.connect("added", lambda x, item: self._add_item(item))
+        for item in system_tray.items:
+            self._add_item(item)
+
+        if os.environ.get(STATS_REPORT_ENV) == "1":
+            Utils.Timeout(STATS_REPORT_INTERVAL, self.__report_stats)
+
+    @classmethod
+    def get_default(cls) -> "TrayModel":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @GObject.Signal(arg_types=(object,))
+    def added(self, entry): ...
+
+    @GObject.Property(type=object)
+    def entries(self) -> list[TrayEntry]:
+        return list(self._entries.values())
+
+    @property
+    def icons(self) -> IconCache:
+        return self._icons
+
+    def get_update_stats(self) -> dict[str, dict[str, int]]:
+        """
+        Icon/tooltip update counters per application, noisiest first.
+        """
+        return dict(
+            sorted(
+                self._stats.items(),
+                key=lambda kv: kv[1]["icon_received"] + kv[1]["tooltip_received"],
+                reverse=True,
+            )
+        )
+
+    def print_update_stats(self) -> None:
+        for app, stats in self.get_update_stats().items():
+            print(
+                f"{app}: icon {stats['icon_applied']}/{stats['icon_received']} applied"
+                f" ({stats['icon_skipped']} identical),"
+                f" tooltip {stats['tooltip_applied']}/{stats['tooltip_received']} applied"
+                f" ({stats['tooltip_skipped']} identical)"
+            )
+
+    def __report_stats(self) -> None:
+        if self._stats:
+            print("Tray updates per application:")
+            self.print_update_stats()
+        Utils.Timeout(STATS_REPORT_INTERVAL, self.__report_stats)
+
+    def _add_item(self, item: SystemTrayItem):
+        if item in self._entries:
+            return
+        app = item.id or item.title or "unknown"
+        stats = self._stats.setdefault(app, _new_stats())
+        entry = TrayEntry(item, self._icons, stats, self._update_interval)
+        self._entries[item] = entry
+        entry.connect("removed", lambda x: self._entries.pop(item, None))
+        self.emit("added", entry)
@@ -1,9 +1,15 @@
 from ignis.widgets import Widget
-from ignis.services.system_tray import SystemTrayItem, SystemTrayService
+from ignis.utils import Utils
 
 import asyncio
+import time
+
+from .icons import ICON_SIZE
+from .model import TrayEntry, TrayModel
+
+# How long a materialized menu is kept around after it was last used (ms)
+MENU_IDLE_TIMEOUT = 60_000
 
-system_tray = SystemTrayService.get_default()
 
 class TrayItem(Widget.Button):
     """
@@ -11,29 +17,110 @@ class TrayItem(Widget.Button):
     """
     __gtype_name__ = "TrayItem"
 
-    def __init__(self, item: SystemTrayItem):
-        self.item = item
-        
-        # Create menu if available
-        self._menu = item.menu.copy() if item.menu else None
-        
-        # Initialize with box containing icon and menu
+    def __init__(
+        self,
+        entry: TrayEntry,
+        menu_idle_timeout: int = MENU_IDLE_TIMEOUT,
+        on_removed=None,
+    ):
+        self.entry = entry
+        self._on_removed_callback = on_removed
+        self.item = entry.item
+
+        # The DBusMenu copy is only built when the menu is actually opened
+        self._menu = None
+        self._menu_idle_timeout = menu_idle_timeout
+        self._menu_release_timeout = None
+
+        # The icon is decoded once by the shared model, we only show its paintable
+        self._icon = Widget.Icon(pixel_size=ICON_SIZE)
+        self._set_icon(entry.icon)
+
+        self._box = Widget.Box(child=[self._icon])
+
         super().__init__(
-            child=Widget.Box(
-                child=[
-                    Widget.Icon(image=item.bind("icon"), pixel_size=24),
-                    self._menu,
-                ]
-            ),
-            tooltip_text=item.bind("tooltip"),
+            child=self._box,
+            tooltip_text=entry.tooltip,
             on_click=self._on_click,
-            on_right_click=lambda x: self._menu.popup() if self._menu else None,
+            on_right_click=lambda x: self._popup_menu(),
             css_classes=["tray-item"]
         )
-        
-        # Connect to the removed signal
-        item.connect("removed", lambda x: self.unparent())
-    
+
+        # The entry is shared and outlives this widget, keep the handler ids
+        # so teardown can let go of it
+        self._handlers = [
+            entry.connect("notify::icon", lambda x, pspec: self._set_icon(x.icon)),
+            entry.connect(
+                "notify::tooltip",
+                lambda x, pspec: self.set_tooltip_text(x.tooltip),
+            ),
+            entry.connect("removed", lambda x: self._on_removed()),
+        ]
+
+    def teardown(self):
+        """Disconnect from the shared entry and drop the menu."""
+        for handler in self._handlers:
+            self.entry.disconnect(handler)
+        self._handlers = []
+        self._release_menu()
+
+    def _set_icon(self, paintable):
+        if paintable is None:
+            self._icon.set_from_icon_name("image-missing")
+        else:
+            self._icon.set_from_paintable(paintable)
+
+    def _on_removed(self):
+        self.teardown()
+        self.unparent()
+        if self._on_removed_callback is not None:
+            self._on_removed_callback(self)
+
+    def _ensure_menu(self):
+        """
+        Build the menu copy on first use.
+        """
+        if self._menu is None and self.item.menu:
+            self._menu = self.item.menu.copy()
+            self._box.append(self._menu)
+        return self._menu
+
+    def _popup_menu(self):
+        """
+        Show the menu, materializing it if needed, and restart the idle timer.
+        """
+        menu = self._ensure_menu()
+        if not menu:
+            return
+        menu.popup()
+        self._schedule_menu_release()
+
+    def _schedule_menu_release(self):
+        if self._menu_release_timeout is not None:
+            self._menu_release_timeout.cancel()
+        self._menu_release_timeout = Utils.Timeout(
+            self._menu_idle_timeout, self._on_menu_idle
+        )
+
+    def _on_menu_idle(self):
+        self._menu_release_timeout = None
+        # Keep the menu while it is still open
+        if self._menu is not None and self._menu.get_visible():
+            self._schedule_menu_release()
+            return
+        self._release_menu()
+
+    def _release_menu(self):
+        """
+        Drop the menu copy so it can be garbage collected.
+        """
+        if self._menu_release_timeout is not None:
+            self._menu_release_timeout.cancel()
+            self._menu_release_timeout = None
+        if self._menu is not None:
+            self._menu.unparent()
+            self._menu = None
+
     def _on_click(self, _):
         """
         Handle click events safely, catching DBus errors if the item doesn't support Activate.
@@ -43,9 +130,8 @@ class TrayItem(Widget.Button):
             asyncio.create_task(self._safe_activate())
         except Exception:
             # If activation fails, show the menu if available
-            if self._menu:
-                self._menu.popup()
-    
+            self._popup_menu()
+
     async def _safe_activate(self):
         """
         Safely activate the item, catching DBus errors.
@@ -54,8 +140,7 @@ class TrayItem(Widget.Button):
             await self.item.activate_async()
         except Exception:
             # If activation fails, show the menu if available
-            if self._menu:
-                self._menu.popup()
+            self._popup_menu()
 
 class Tray(Widget.Box):
     """
@@ -68,31 +153,53 @@ class Tray(Widget.Box):
         self.add_css_class("system-tray")
         self._tray_items = []
         self._is_setup = False
+        self._added_handler = None
 
     async def setup(self):
         if self._is_setup:
             return
-        system_tray.connect("added", self._on_item_added)
+        started = time.perf_counter()
+        model = TrayModel.get_default()
+
+        # Build every already registered item in one pass and insert them
+        # with a single layout update instead of one task per item
+        widgets = [self._track(entry) for entry in model.entries]
+        self.child = widgets
+
+        self._added_handler = model.connect("added", self._on_item_added)
         self._is_setup = True
 
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"Tray: {len(widgets)} items ready in {elapsed:.1f} ms")
+
     def __post_init__(self):
         asyncio.create_task(self.setup())
 
     def clear_tray_items(self):
         for item_widget in self._tray_items:
+            item_widget.teardown()
             item_widget.unparent()
         self._tray_items.clear()
 
-    def _on_item_added(self, service, item: SystemTrayItem):
-        """
-        Non-async wrapper for on_item_added that creates a task
-        """
-        asyncio.create_task(self.on_item_added(service, item))
+    def teardown(self):
+        """Stop following the shared tray model, e.g. when the bar goes away."""
+        if self._added_handler is not None:
+            TrayModel.get_default().disconnect(self._added_handler)
+            self._added_handler = None
+        self.clear_tray_items()
 
-    async def on_item_added(self, service, item: SystemTrayItem):
+    def _on_item_added(self, model, entry: TrayEntry):
         """
-        Handler for 'added' signal. Create and setup the TrayItem
+        Handler for 'added' signal. Items registered after startup are
+        appended one at a time.
         """
-        tray_item_widget = TrayItem(item)
-        self.append(tray_item_widget)
+        self.append(self._track(entry))
+
+    def _track(self, entry: TrayEntry) -> TrayItem:
+        tray_item_widget = TrayItem(entry, on_removed=self._forget)
         self._tray_items.append(tray_item_widget)
+        return tray_item_widget
+
+    def _forget(self, tray_item_widget: TrayItem):
+        if tray_item_widget in self._tray_items:
+            self._tray_items.remove(tray_item_widget)
@@ -1,7 +1,18 @@
 # from .toggle_box import ToggleBox
-from .utils import NotificationWidget
+from .utils import NotificationWidget, NotificationWidgetPool
+from .monitors import (
+    get_monitor_index,
+    get_focused_output,
+    get_focused_monitor,
+    MonitorManager,
+)
 # from .volume_slider import MaterialVolumeSlider
 
 __all__ = [
            "NotificationWidget",
+           "NotificationWidgetPool",
+           "get_monitor_index",
+           "get_focused_output",
+           "get_focused_monitor",
+           "MonitorManager",
            ]
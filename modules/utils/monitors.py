@@ -0,0 +1,159 @@
+from typing import Callable, Optional
+
+from gi.repository import Gdk  # type: ignore
+from ignis.utils import Utils
+from ignis.services.hyprland import HyprlandService
+from ignis.services.niri import NiriService
+
+hyprland = HyprlandService.get_default()
+niri = NiriService.get_default()
+
+# How long windows of a vanished output are kept for reuse (ms), long enough
+# to ride out DPMS and dock flaps
+REUSE_GRACE = 30_000
+
+
+def get_monitor_index(connector: str) -> Optional[int]:
+    """Return the GDK monitor index of an output connector, e.g. "eDP-1"."""
+    for i in range(Utils.get_n_monitors()):
+        monitor = Utils.get_monitor(i)
+        if monitor is not None and monitor.get_connector() == connector:
+            return i
+    return None
+
+
+def get_focused_output() -> Optional[str]:
+    """Return the connector name of the focused output, if the compositor tells us."""
+    try:
+        if hyprland.is_available:
+            for monitor in hyprland.monitors:
+                if monitor.focused:
+                    return monitor.name
+        elif niri.is_available and niri.active_output:
+            return niri.active_output["name"]
+    except Exception as e:
+        print(f"Error getting focused output: {e}")
+    return None
+
+
+def get_focused_monitor() -> Optional[int]:
+    """Return the GDK monitor index of the focused output."""
+    output = get_focused_output()
+    if output is None:
+        return None
+    return get_monitor_index(output)
+
+
+class MonitorManager:
+    """
+    Keeps one window per kind (bar, popups, ...) on every connected output.
+
+    ``factories`` map a kind to ``factory(monitor_index, connector)``. The
+    windows must provide ``set_monitor(index)``, which is called when GDK
+    renumbers the outputs, and ``set_monitor(None)`` when their output goes
+    away. Such windows are kept for ``reuse_grace`` ms and handed back if
+    the same connector returns; only then are they destroyed, after their
+    ``teardown()`` has let go of service handlers, polls and timers.
+    """
+
+    def __init__(
+        self,
+        factories: dict[str, Callable[[int, str], object]],
+        reuse_grace: int = REUSE_GRACE,
+    ):
+        self._factories = factories
+        self._reuse_grace = reuse_grace
+        self._windows: dict[str, dict[str, object]] = {}
+        self._indices: dict[str, int] = {}
+        self._release_timeouts: dict[str, Utils.Timeout] = {}
+        self._pending: set[Gdk.Monitor] = set()
+        self._monitors = None
+
+    def start(self) -> None:
+        """Create windows for the current outputs and follow hotplug."""
+        if self._monitors is not None:
+            return
+        self._monitors = Gdk.Display.get_default().get_monitors()
+        self._monitors.connect("items-changed", lambda *_: self._sync())
+        self._sync()
+
+    @property
+    def outputs(self) -> list[str]:
+        """Connectors that currently have windows shown on them."""
+        return list(self._indices)
+
+    def get_windows(self, connector: str) -> dict[str, object]:
+        return dict(self._windows.get(connector, {}))
+
+    def _current(self) -> dict[str, int]:
+        current: dict[str, int] = {}
+        for index in range(self._monitors.get_n_items()):
+            monitor = self._monitors.get_item(index)
+            connector = monitor.get_connector()
+            if connector is None:
+                # Wayland fills the connector in a little later
+                self._watch_connector(monitor)
+                continue
+            current[connector] = index
+        return current
+
+    def _watch_connector(self, monitor: Gdk.Monitor) -> None:
+        if monitor in self._pending:
+            return
+        self._pending.add(monitor)
+
+        def on_connector(*_):
+            self._pending.discard(monitor)
+            monitor.disconnect(handler)
+            self._sync()
+
+        handler = monitor.connect("notify::connector", on_connector)
+
+    def _sync(self) -> None:
+        current = self._current()
+
+        for connector in [c for c in self._indices if c not in current]:
+            self._detach(connector)
+
+        for connector, index in current.items():
+            if connector not in self._windows:
+                self._create(connector, index)
+            elif self._indices.get(connector) != index:
+                self._attach(connector, index)
+
+    def _create(self, connector: str, index: int) -> None:
+        windows = {}
+        for kind, factory in self._factories.items():
+            try:
+                windows[kind] = factory(index, connector)
+            except Exception as e:
+                print(f"Error creating {kind} for {connector}: {e}")
+        self._windows[connector] = windows
+        self._indices[connector] = index
+        print(f"Output {connector} added")
+
+    def _attach(self, connector: str, index: int) -> None:
+        timeout = self._release_timeouts.pop(connector, None)
+        if timeout is not None:
+            timeout.cancel()
+            print(f"Output {connector} is back, reusing its windows")
+        self._indices[connector] = index
+        for window in self._windows[connector].values():
+            window.set_monitor(index)
+
+    def _detach(self, connector: str) -> None:
+        del self._indices[connector]
+        for window in self._windows[connector].values():
+            window.set_monitor(None)
+        self._release_timeouts[connector] = Utils.Timeout(
+            self._reuse_grace, lambda: self._release(connector)
+        )
+
+    def _release(self, connector: str) -> None:
+        self._release_timeouts.pop(connector, None)
+        if connector in self._indices:
+            return
+        for window in self._windows.pop(connector, {}).values():
+            window.teardown()
+            window.destroy()
+        print(f"Output {connector} removed")
@@ -0,0 +1,189 @@
+import math
+import os
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from ignis.widgets import Widget
+from ignis.utils import Utils
+from gi.repository import Gdk, GdkPixbuf, Gtk  # type: ignore
+
+# Maximum number of decoded thumbnails kept in memory
+THUMBNAIL_CACHE_SIZE = 64
+# Shown in place of an image that cannot be read or decoded
+FALLBACK_ICON = "image-missing"
+
+
+def _decode(path: str, width: int, height: int) -> Optional[GdkPixbuf.Pixbuf]:
+    """
+    Decode an image already downscaled so that it still covers width x height.
+    Runs in a worker thread.
+    """
+    try:
+        info = GdkPixbuf.Pixbuf.get_file_info(path)
+        if info is None or info[0] is None:
+            return None
+        _, src_width, src_height = info
+        scale = min(1.0, max(width / src_width, height / src_height))
+        return GdkPixbuf.Pixbuf.new_from_file_at_scale(
+            path,
+            max(1, math.ceil(src_width * scale)),
+            max(1, math.ceil(src_height * scale)),
+            True,
+        )
+    except Exception as e:
+        print(f"Error decoding thumbnail {path}: {e}")
+        return None
+
+
+class ThumbnailCache:
+    """
+    A bounded cache of downscaled images, keyed by path, mtime and size.
+
+    Images are decoded off the GTK thread; concurrent requests for the same
+    thumbnail share one decode. Screenshot previews, notification icons and
+    image-data hints (which the notification service stores as files) all go
+    through the same cache, so a popup and its notification center entry
+    share one texture.
+    """
+
+    _instance: "ThumbnailCache | None" = None
+
+    def __init__(self, max_entries: int = THUMBNAIL_CACHE_SIZE):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple, Gdk.Texture] = OrderedDict()
+        self._pending: dict[tuple, list[Callable]] = {}
+
+    @classmethod
+    def get_default(cls) -> "ThumbnailCache":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def request(
+        self,
+        path: str,
+        width: int,
+        height: int,
+        callback: Callable[[Optional[Gdk.Texture]], None],
+    ) -> None:
+        """
+        Call ``callback`` with the thumbnail, right away if it is cached, or
+        with None if ``path`` is empty or cannot be decoded.
+        """
+        if not path or not isinstance(path, str):
+            callback(None)
+            return
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            callback(None)
+            return
+
+        key = (path, mtime, width, height)
+        texture = self._entries.get(key)
+        if texture is not None:
+            self._entries.move_to_end(key)
+            callback(texture)
+            return
+
+        if key in self._pending:
+            self._pending[key].append(callback)
+            return
+
+        self._pending[key] = [callback]
+        Utils.ThreadTask(
+            lambda: _decode(path, width, height),
+            lambda pixbuf: self._on_decoded(key, pixbuf),
+        ).run()
+
+    def _on_decoded(self, key: tuple, pixbuf: Optional[GdkPixbuf.Pixbuf]) -> None:
+        texture = Gdk.Texture.new_for_pixbuf(pixbuf) if pixbuf is not None else None
+        if texture is not None:
+            self._entries[key] = texture
+            if len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+        for callback in self._pending.pop(key, []):
+            callback(texture)
+
+
+def is_image_file(icon: str | None) -> bool:
+    return bool(icon) and os.path.isabs(icon) and os.path.isfile(icon)
+
+
+class Thumbnail(Widget.Picture):
+    """
+    A Picture that shows a cached, downscaled image once it is decoded.
+    """
+
+    def __init__(
+        self,
+        path: str | None,
+        width: int,
+        height: int,
+        fallback: str = FALLBACK_ICON,
+        **kwargs,
+    ):
+        super().__init__(width=width, height=height, **kwargs)
+        self._size = (width, height)
+        self._fallback = fallback
+        self._request = 0
+        self.set_path(path)
+
+    def set_path(self, path: str | None) -> None:
+        # Results of requests made for a previous path are ignored
+        self._request += 1
+        self.set_paintable(None)
+        if path:
+            request = self._request
+            ThumbnailCache.get_default().request(
+                path, *self._size, lambda texture: self._on_ready(request, texture)
+            )
+
+    def _on_ready(self, request: int, texture: Optional[Gdk.Texture]) -> None:
+        if request != self._request:
+            return
+        if texture is not None:
+            self.set_paintable(texture)
+        else:
+            theme = Gtk.IconTheme.get_for_display(Gdk.Display.get_default())
+            self.set_paintable(
+                theme.lookup_icon(
+                    self._fallback, None, min(self._size), 1, Gtk.TextDirection.NONE, 0
+                )
+            )
+
+
+class ThumbnailIcon(Widget.Icon):
+    """
+    An Icon for notification icons: themed names are shown directly, image
+    files go through the thumbnail cache.
+    """
+
+    def __init__(self, icon: str | None, fallback: str, pixel_size: int, **kwargs):
+        super().__init__(pixel_size=pixel_size, **kwargs)
+        self._fallback = fallback
+        self._request = 0
+        self.set_icon(icon)
+
+    def set_icon(self, icon: str | None) -> None:
+        self._request += 1
+        if is_image_file(icon):
+            self.image = self._fallback
+            request = self._request
+            ThumbnailCache.get_default().request(
+                icon,
+                self.pixel_size,
+                self.pixel_size,
+                lambda texture: self._on_ready(request, texture),
+            )
+        else:
+            self.image = icon or self._fallback
+
+    def _on_ready(self, request: int, texture: Optional[Gdk.Texture]) -> None:
+        if request != self._request:
+            return
+        if texture is not None:
+            self.set_from_paintable(texture)
+        else:
+            self.image = self._fallback
@@ -1,23 +1,34 @@
 from ignis.widgets import Widget
 from ignis.services.notifications import Notification
 from ignis.utils import Utils
+from gi.repository import Gtk  # type: ignore
+from .thumbnails import Thumbnail, ThumbnailIcon
+
+# Size of screenshot previews
+SCREENSHOT_WIDTH = 1920 // 7
+SCREENSHOT_HEIGHT = 1080 // 7
+# Maximum number of released notification widgets kept for reuse
+WIDGET_POOL_SIZE = 16
 
 
 class ScreenshotLayout(Widget.Box):
-    def __init__(self, notification: Notification) -> None:
+    def __init__(self) -> None:
+        self._notification: Notification | None = None
+        self._picture = Thumbnail(
+            None,
+            SCREENSHOT_WIDTH,
+            SCREENSHOT_HEIGHT,
+            content_fit="cover",
+            style="border-radius: 1rem; background-color: black;",
+        )
+
         super().__init__(
             vertical=True,
             hexpand=True,
             child=[
                 Widget.Box(
                     child=[
-                        Widget.Picture(
-                            image=notification.icon,
-                            content_fit="cover",
-                            width=1920 // 7,
-                            height=1080 // 7,
-                            style="border-radius: 1rem; background-color: black;",
-                        ),
+                        self._picture,
                         Widget.Button(
                             child=Widget.Icon(
                                 image="window-close-symbolic", pixel_size=20
@@ -26,7 +37,7 @@ class ScreenshotLayout(Widget.Box):
                             valign="start",
                             hexpand=True,
                             css_classes=["notification-close"],
-                            on_click=lambda x: notification.close(),
+                            on_click=lambda x: self._close(),
                         ),
                     ],
                 ),
@@ -42,56 +53,66 @@ class ScreenshotLayout(Widget.Box):
                         Widget.Button(
                             child=Widget.Label(label="Open"),
                             css_classes=["notification-action"],
-                            on_click=lambda x: Utils.exec_sh_async(
-                                f"xdg-open {notification.icon}"
-                            ),
+                            on_click=lambda x: self._open(),
                         ),
                         Widget.Button(
                             child=Widget.Label(label="Close"),
                             css_classes=["notification-action"],
-                            on_click=lambda x: notification.close(),
+                            on_click=lambda x: self._close(),
                         ),
                     ],
                 ),
             ],
         )
 
+    def bind(self, notification: Notification | None) -> None:
+        self._notification = notification
+        self._picture.set_path(notification.icon if notification else None)
+
+    def _open(self):
+        if self._notification:
+            Utils.exec_sh_async(f"xdg-open {self._notification.icon}")
+
+    def _close(self):
+        if self._notification:
+            self._notification.close()
+
 
 class NormalLayout(Widget.Box):
-    def __init__(self, notification: Notification) -> None:
+    def __init__(self) -> None:
+        self._notification: Notification | None = None
+        self._icon = ThumbnailIcon(
+            None,
+            fallback="dialog-information-symbolic",
+            pixel_size=48,
+            halign="start",
+            valign="start",
+        )
+        self._summary = Widget.Label(
+            ellipsize="end",
+            halign="start",
+            css_classes=["notification-summary"],
+        )
+        self._body = Widget.Label(
+            ellipsize="end",
+            halign="start",
+            css_classes=["notification-body"],
+        )
+        # Action buttons are reused, up to the largest action count seen
+        self._action_buttons: list[Widget.Button] = []
+        self._actions_box = Widget.Box(homogeneous=True, spacing=10)
+
         super().__init__(
             vertical=True,
             hexpand=True,
             child=[
                 Widget.Box(
                     child=[
-                        Widget.Icon(
-                            image=notification.icon
-                            if notification.icon
-                            else "dialog-information-symbolic",
-                            pixel_size=48,
-                            halign="start",
-                            valign="start",
-                        ),
+                        self._icon,
                         Widget.Box(
                             vertical=True,
                             style="margin-left: 0.75rem;",
-                            child=[
-                                Widget.Label(
-                                    ellipsize="end",
-                                    label=notification.summary,
-                                    halign="start",
-                                    visible=notification.summary != "",
-                                    css_classes=["notification-summary"],
-                                ),
-                                Widget.Label(
-                                    label=notification.body,
-                                    ellipsize="end",
-                                    halign="start",
-                                    css_classes=["notification-body"],
-                                    visible=notification.body != "",
-                                ),
-                            ],
+                            child=[self._summary, self._body],
                         ),
                         Widget.Button(
                             child=Widget.Icon(
@@ -101,40 +122,138 @@ class NormalLayout(Widget.Box):
                             valign="start",
                             hexpand=True,
                             css_classes=["notification-close"],
-                            on_click=lambda x: notification.close(),
+                            on_click=lambda x: self._close(),
                         ),
                     ],
                 ),
-                Widget.Box(
-                    child=[
-                        Widget.Button(
-                            child=Widget.Label(label=action.label),
-                            on_click=lambda x, action=action: (
-                                print(f"Invoking action: {action.label}"),
-                                action.invoke()
-                            ),
-                            css_classes=["notification-action"],
-                        )
-                        for action in notification.actions
-                    ],
-                    homogeneous=True,
-                    style="margin-top: 0.75rem;" if notification.actions else "",
-                    spacing=10,
-                ),
+                self._actions_box,
             ],
         )
 
+    def bind(self, notification: Notification | None) -> None:
+        self._notification = notification
+        if notification is None:
+            self._icon.set_icon(None)
+            return
+
+        self._icon.set_icon(notification.icon)
+        self._summary.label = notification.summary
+        self._summary.visible = notification.summary != ""
+        self._body.label = notification.body
+        self._body.visible = notification.body != ""
+
+        actions = notification.actions
+        while len(self._action_buttons) < len(actions):
+            index = len(self._action_buttons)
+            button = Widget.Button(
+                child=Widget.Label(),
+                on_click=lambda x, index=index: self._invoke(index),
+                css_classes=["notification-action"],
+            )
+            self._action_buttons.append(button)
+            self._actions_box.append(button)
+
+        for index, button in enumerate(self._action_buttons):
+            if index < len(actions):
+                button.child.label = actions[index].label
+                button.visible = True
+            else:
+                button.visible = False
+
+        self._actions_box.style = "margin-top: 0.75rem;" if actions else ""
+
+    def _invoke(self, index: int):
+        if self._notification is None:
+            return
+        action = self._notification.actions[index]
+        print(f"Invoking action: {action.label}")
+        action.invoke()
+
+    def _close(self):
+        if self._notification:
+            self._notification.close()
+
 
 class NotificationWidget(Widget.Box):
-    def __init__(self, notification: Notification) -> None:
+    """
+    Shows a notification and can be rebound to another one, so the same
+    widget tree serves many notifications.
+    """
+
+    def __init__(self, notification: Notification | None = None) -> None:
+        self._normal: NormalLayout | None = None
+        self._screenshot: ScreenshotLayout | None = None
+        self.notification: Notification | None = None
+
+        super().__init__(css_classes=["notification"])
+
+        if notification is not None:
+            self.bind(notification)
+
+    def bind(self, notification: Notification) -> None:
         layout: NormalLayout | ScreenshotLayout
 
         if notification.app_name == "grimblast":
-            layout = ScreenshotLayout(notification)
+            if self._screenshot is None:
+                self._screenshot = ScreenshotLayout()
+            layout = self._screenshot
         else:
-            layout = NormalLayout(notification)
+            if self._normal is None:
+                self._normal = NormalLayout()
+            layout = self._normal
 
-        super().__init__(
-            css_classes=["notification"],
-            child=[layout],
-        )
+        self.notification = notification
+        layout.bind(notification)
+        if self.child != [layout]:
+            self.child = [layout]
+
+    def unbind(self) -> None:
+        """Drop the reference to the notification, keeping the widgets."""
+        self.notification = None
+        for layout in (self._normal, self._screenshot):
+            if layout is not None:
+                layout.bind(None)
+
+
+class NotificationWidgetPool:
+    """
+    Reusable NotificationWidgets for popups, so steady notification traffic
+    does not allocate new widget trees.
+    """
+
+    _instance: "NotificationWidgetPool | None" = None
+
+    def __init__(self, max_size: int = WIDGET_POOL_SIZE):
+        self._max_size = max_size
+        self._free: list[NotificationWidget] = []
+
+    @classmethod
+    def get_default(cls) -> "NotificationWidgetPool":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def acquire(
+        self, notification: Notification, css_classes: list[str] | None = None
+    ) -> NotificationWidget:
+        widget = self._free.pop() if self._free else NotificationWidget()
+        widget.css_classes = css_classes or ["notification"]
+        widget.bind(notification)
+        return widget
+
+    def release(self, widget: NotificationWidget) -> None:
+        """
+        Take a widget back. Widgets in a Box (stack items) are removed from
+        it; single-child containers such as revealers must drop the widget
+        with ``set_child(None)`` first, or they unparent it again later.
+        """
+        parent = widget.get_parent()
+        if isinstance(parent, Gtk.Box):
+            parent.remove(widget)
+        elif parent is not None:
+            print("Not reusing a notification widget that is still in use")
+            widget.unbind()
+            return
+        widget.unbind()
+        if len(self._free) < self._max_size:
+            self._free.append(widget)
@@ -29,52 +29,65 @@ class Workspaces(Widget.EventBox):
             on_scroll_down=lambda x: self._scroll_workspaces("down"),
             css_classes=["workspaces"],
             spacing=5,
-            child=self._create_workspace_box()
         )
 
+        # (object, handler id) pairs, disconnected again in teardown
+        self._handlers = []
+
         # Set up workspace change signals
         if self.hyprland.is_available:
             # Listen for active workspace changes
-            self.hyprland.connect("notify::active-workspace", lambda *_: self.update(immediate=True))
+            self._connect(self.hyprland, "notify::active-workspace", lambda *_: self.update(immediate=True))
             # Also listen for workspace list changes (added/removed workspaces)
-            self.hyprland.connect("notify::workspaces", lambda *_: self.update())
+            self._connect(self.hyprland, "notify::workspaces", lambda *_: self._rebuild())
             # Listen for monitor changes which can affect active workspaces
-            self.hyprland.connect("notify::monitors", lambda *_: self.update())
+            self._connect(self.hyprland, "notify::monitors", lambda *_: self.update())
             # Listen for special workspace changes
             for monitor in self.hyprland.monitors:
-                monitor.connect("notify::special-workspace-id", lambda *_: self.update())
-                monitor.connect("notify::special-workspace-name", lambda *_: self.update())
+                self._connect(monitor, "notify::special-workspace-id", lambda *_: self.update())
+                self._connect(monitor, "notify::special-workspace-name", lambda *_: self.update())
         elif self.niri.is_available:
-            self.niri.connect("notify::workspaces", lambda *_: self.update(immediate=True))
+            self._connect(self.niri, "notify::workspaces", lambda *_: self._rebuild(immediate=True))
+
+        self._rebuild(immediate=True)
+
+    def _connect(self, obj, signal: str, callback) -> None:
+        self._handlers.append((obj, obj.connect(signal, callback)))
 
-    def _create_workspace_box(self) -> Widget.Box:
-        """Create the main workspace container with appropriate bindings."""
-        # for workspace in self.hyprland.workspaces:
-        #     print(workspace.id)
+    def teardown(self) -> None:
+        """Disconnect from the window manager services and stop pending updates."""
+        for obj, handler in self._handlers:
+            obj.disconnect(handler)
+        self._handlers = []
+        if self._update_timeout_id is not None:
+            GLib.source_remove(self._update_timeout_id)
+            self._update_timeout_id = None
+
+    def _rebuild(self, immediate=False) -> None:
+        """Rebuild the workspace buttons, then refresh the active one."""
+        self.child = self._create_workspace_buttons()
+        self.update(immediate=immediate)
+
+    def _create_workspace_buttons(self) -> list:
+        """Create the buttons for the workspaces of this monitor."""
         if self.hyprland.is_available:
-            box = self.hyprland.bind(
-                "workspaces",
-                transform=lambda value: [self._create_workspace_button(i) for i in value]
-            )
+            buttons = [self._create_workspace_button(i) for i in self.hyprland.workspaces]
 
             # Add special workspaces if they exist
-            self._add_special_workspaces(box)
+            self._add_special_workspaces(buttons)
 
-            return box
+            return buttons
         elif self.niri.is_available:
-            return self.niri.bind(
-                "workspaces",
-                transform=lambda value: [
-                    self._create_workspace_button(i)
-                    for i in value
-                    if i["output"] == self._monitor_name
-                ]
-            )
+            return [
+                self._create_workspace_button(i)
+                for i in self.niri.workspaces
+                if i["output"] == self._monitor_name
+            ]
         else:
-            return Widget.Box()
+            return []
 
-    def _add_special_workspaces(self, box: Widget.Box) -> None:
-        """Add special workspace buttons to the workspace box."""
+    def _add_special_workspaces(self, buttons: list) -> None:
+        """Add special workspace buttons to the workspace buttons."""
         if not self.hyprland.is_available:
             return
 
@@ -93,7 +106,7 @@ class Workspaces(Widget.EventBox):
                     monitor.special_workspace_name,
                     monitor.name
                 )
-                box.append(special_button)
+                buttons.append(special_button)
             except Exception as e:
                 print(f"Error adding special workspace: {e}")
 